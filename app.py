@@ -12,6 +12,7 @@ from flask_restx import Api
 from sudoku_api.monitoring import init_sentry
 from sudoku_api.config import Config
 from sudoku_api.api_models import create_models
+from sudoku_api.auth import warm_up_firebase
 from sudoku_api.extensions import limiter
 from sudoku_api.middleware import register_hooks
 from sudoku_api.routes import register_routes
@@ -49,6 +50,8 @@ def create_app():
     models = create_models(api)
     register_routes(api, models)
 
+    warm_up_firebase()
+
     return app
 
 
@@ -0,0 +1,48 @@
+-- Migración 002: Secuencia densa por dificultad para elegir puzzles al azar en O(1)
+-- Ejecutar: railway run psql $DATABASE_URL -f migrations/002_puzzle_seq.sql
+
+ALTER TABLE puzzles ADD COLUMN IF NOT EXISTS seq INTEGER;
+
+-- Backfill: numerar 1..N por dificultad (en orden de id) las filas sin seq
+UPDATE puzzles p
+SET seq = base.max_seq + numbered.rn
+FROM (
+    SELECT id, difficulty,
+           ROW_NUMBER() OVER (PARTITION BY difficulty ORDER BY id) AS rn
+    FROM puzzles
+    WHERE seq IS NULL
+) numbered
+JOIN (
+    SELECT difficulty, COALESCE(MAX(seq), 0) AS max_seq
+    FROM puzzles
+    GROUP BY difficulty
+) base ON base.difficulty = numbered.difficulty
+WHERE p.id = numbered.id;
+
+ALTER TABLE puzzles ALTER COLUMN seq SET NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_puzzles_difficulty_seq ON puzzles(difficulty, seq);
+
+-- Los nuevos puzzles toman el siguiente seq de su dificultad (también con COPY).
+-- El advisory lock serializa los inserts concurrentes de una misma dificultad
+-- (p. ej. la app y scripts/populate.py): sin él ambos leen el mismo MAX y el
+-- segundo falla contra idx_puzzles_difficulty_seq. Se libera al terminar la
+-- transacción, y el MAX se lee después con un snapshot que ya ve al otro.
+CREATE OR REPLACE FUNCTION assign_puzzle_seq() RETURNS trigger AS $$
+BEGIN
+    IF NEW.seq IS NULL THEN
+        PERFORM pg_advisory_xact_lock(hashtext('puzzle_seq:' || NEW.difficulty));
+        SELECT COALESCE(MAX(seq), 0) + 1 INTO NEW.seq
+        FROM puzzles
+        WHERE difficulty = NEW.difficulty;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_puzzles_seq ON puzzles;
+CREATE TRIGGER trg_puzzles_seq
+    BEFORE INSERT ON puzzles
+    FOR EACH ROW EXECUTE FUNCTION assign_puzzle_seq();
+
+COMMENT ON COLUMN puzzles.seq IS 'Secuencia 1..N por dificultad para selección aleatoria indexada (puede tener huecos tras borrados)';
@@ -0,0 +1,9 @@
+-- Migración 003: Calendario precalculado de puzzles diarios
+-- Ejecutar: railway run psql $DATABASE_URL -f migrations/003_daily_schedule.sql
+
+ALTER TABLE puzzles ADD COLUMN IF NOT EXISTS date_assigned DATE;
+
+-- Un solo puzzle diario por dificultad y fecha; la búsqueda diaria es un point lookup
+CREATE UNIQUE INDEX IF NOT EXISTS idx_puzzles_daily
+    ON puzzles(difficulty, date_assigned)
+    WHERE date_assigned IS NOT NULL;
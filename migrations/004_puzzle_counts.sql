@@ -0,0 +1,76 @@
+-- Migración 004: Conteo de puzzles por dificultad mantenido por trigger
+-- Ejecutar: railway run psql $DATABASE_URL -f migrations/004_puzzle_counts.sql
+
+CREATE TABLE IF NOT EXISTS puzzle_counts (
+    difficulty VARCHAR(20) PRIMARY KEY,
+    count BIGINT NOT NULL DEFAULT 0
+);
+
+-- Triggers por sentencia con tablas de transición: un COPY o INSERT masivo
+-- actualiza cada dificultad una sola vez
+CREATE OR REPLACE FUNCTION count_inserted_puzzles() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO puzzle_counts (difficulty, count)
+    SELECT difficulty, COUNT(*) FROM new_rows GROUP BY difficulty
+    ON CONFLICT (difficulty) DO UPDATE SET count = puzzle_counts.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION count_deleted_puzzles() RETURNS trigger AS $$
+BEGIN
+    UPDATE puzzle_counts c
+    SET count = c.count - d.count
+    FROM (SELECT difficulty, COUNT(*) AS count FROM old_rows GROUP BY difficulty) d
+    WHERE c.difficulty = d.difficulty;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION count_updated_puzzles() RETURNS trigger AS $$
+BEGIN
+    UPDATE puzzle_counts c
+    SET count = c.count + delta.count
+    FROM (
+        SELECT difficulty, SUM(n) AS count FROM (
+            SELECT difficulty, 1 AS n FROM new_rows
+            UNION ALL
+            SELECT difficulty, -1 AS n FROM old_rows
+        ) moved
+        GROUP BY difficulty
+    ) delta
+    WHERE c.difficulty = delta.difficulty AND delta.count <> 0;
+
+    INSERT INTO puzzle_counts (difficulty, count)
+    SELECT difficulty, COUNT(*) FROM new_rows
+    WHERE difficulty NOT IN (SELECT difficulty FROM puzzle_counts)
+    GROUP BY difficulty;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_puzzles_count_insert ON puzzles;
+CREATE TRIGGER trg_puzzles_count_insert
+    AFTER INSERT ON puzzles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_inserted_puzzles();
+
+DROP TRIGGER IF EXISTS trg_puzzles_count_delete ON puzzles;
+CREATE TRIGGER trg_puzzles_count_delete
+    AFTER DELETE ON puzzles
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_deleted_puzzles();
+
+DROP TRIGGER IF EXISTS trg_puzzles_count_update ON puzzles;
+CREATE TRIGGER trg_puzzles_count_update
+    AFTER UPDATE ON puzzles
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION count_updated_puzzles();
+
+-- Backfill dentro de un lock para no perder inserts concurrentes
+BEGIN;
+LOCK TABLE puzzles IN SHARE MODE;
+DELETE FROM puzzle_counts;
+INSERT INTO puzzle_counts (difficulty, count)
+SELECT difficulty, COUNT(*) FROM puzzles GROUP BY difficulty;
+COMMIT;
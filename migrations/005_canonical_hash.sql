@@ -0,0 +1,10 @@
+-- Migración 005: Hash de la forma canónica para deduplicar puzzles equivalentes
+-- Ejecutar: railway run psql $DATABASE_URL -f migrations/005_canonical_hash.sql
+-- Luego: python scripts/backfill_canonical.py (calcula el hash de las filas existentes)
+
+ALTER TABLE puzzles ADD COLUMN IF NOT EXISTS canonical_hash BIGINT;
+
+-- NULL permitido para filas aún sin backfill (y para duplicados detectados en él)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_puzzles_canonical_hash ON puzzles(canonical_hash);
+
+COMMENT ON COLUMN puzzles.canonical_hash IS 'blake2b de 64 bits de la forma canónica (sudoku_api.canonical): igual para puzzles equivalentes por simetría';
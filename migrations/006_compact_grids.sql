@@ -0,0 +1,20 @@
+-- Migración 006: Grillas como CHAR(81) en lugar de JSON
+-- Ejecutar: railway run psql $DATABASE_URL -f migrations/006_compact_grids.sql
+--
+-- Formato: 81 dígitos fila por fila, '0' = celda vacía (el mismo de
+-- SudokuBoard.to_string). Cada grilla pasa de ~250 bytes de JSON a 81 bytes.
+-- El JSON de una lista 9x9 de enteros 0-9 solo tiene esos dígitos como
+-- números, así que basta con quitar todo lo demás.
+
+ALTER TABLE puzzles
+    ALTER COLUMN playable_grid TYPE CHAR(81)
+        USING regexp_replace(playable_grid::text, '[^0-9]', '', 'g'),
+    ALTER COLUMN solution_grid TYPE CHAR(81)
+        USING regexp_replace(solution_grid::text, '[^0-9]', '', 'g');
+
+ALTER TABLE puzzles
+    ADD CONSTRAINT puzzles_playable_grid_format CHECK (playable_grid ~ '^[0-9]{81}$'),
+    ADD CONSTRAINT puzzles_solution_grid_format CHECK (solution_grid ~ '^[1-9]{81}$');
+
+COMMENT ON COLUMN puzzles.playable_grid IS '81 dígitos fila por fila, 0 = vacía';
+COMMENT ON COLUMN puzzles.solution_grid IS '81 dígitos fila por fila';
@@ -0,0 +1,6 @@
+-- Migración 007: Semilla de la variante transformada con que se juega un puzzle
+-- Ejecutar: railway run psql $DATABASE_URL -f migrations/007_variant_seed.sql
+
+ALTER TABLE game_progress ADD COLUMN IF NOT EXISTS variant_seed INTEGER NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN game_progress.variant_seed IS 'SudokuTransform.from_seed: 0 = puzzle tal como está guardado';
@@ -0,0 +1,6 @@
+-- Migración 008: Versión del progreso para guardados por movimientos
+-- Ejecutar: railway run psql $DATABASE_URL -f migrations/008_progress_version.sql
+
+ALTER TABLE game_progress ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN game_progress.version IS 'Se incrementa en cada escritura; base_version de los guardados por movimientos';
@@ -0,0 +1,71 @@
+"""Calcula `canonical_hash` de los puzzles que aún no lo tienen (migración 005).
+
+Si un puzzle es equivalente a otro ya registrado, su hash queda en NULL y se
+reporta: esas filas pueden seguir referenciadas desde `game_progress`, así
+que no se borran automáticamente.
+
+Uso:
+    DATABASE_URL=... python scripts/backfill_canonical.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sudoku_api.canonical import canonical_hash  # noqa: E402
+from sudoku_api.database import PuzzleDB  # noqa: E402
+from sudoku_api.sudoku_board import SudokuBoard  # noqa: E402
+
+BATCH_SIZE = 500
+
+
+def main():
+    db = PuzzleDB()
+    last_id = 0
+    updated = 0
+    duplicates = []
+
+    while True:
+        with db.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT id, playable_grid, solution_grid FROM puzzles
+                    WHERE canonical_hash IS NULL AND id > %s
+                    ORDER BY id
+                    LIMIT %s
+                    """,
+                    (last_id, BATCH_SIZE),
+                )
+                rows = cur.fetchall()
+                if not rows:
+                    break
+
+                for row in rows:
+                    key = canonical_hash(
+                        SudokuBoard(db.decode_grid(row["playable_grid"])),
+                        SudokuBoard(db.decode_grid(row["solution_grid"])),
+                    )
+                    cur.execute(
+                        """
+                        UPDATE puzzles SET canonical_hash = %s
+                        WHERE id = %s
+                          AND NOT EXISTS (SELECT 1 FROM puzzles WHERE canonical_hash = %s)
+                        """,
+                        (key, row["id"], key),
+                    )
+                    if cur.rowcount:
+                        updated += 1
+                    else:
+                        duplicates.append(row["id"])
+                last_id = rows[-1]["id"]
+        print(f"  {updated} actualizados, {len(duplicates)} duplicados (hasta id {last_id})")
+
+    print(f"Listo: {updated} puzzles con canonical_hash")
+    if duplicates:
+        print(f"Duplicados (canonical_hash en NULL): {duplicates}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Pobla la tabla `puzzles` hasta un objetivo por dificultad.
+
+Genera en paralelo con todos los núcleos y guarda en lotes con COPY. Es
+reanudable: al arrancar lee cuántos puzzles hay por nivel y solo genera los
+que faltan, y cada lote se confirma por separado, así que interrumpirlo pierde
+como máximo el lote en curso. Los puzzles equivalentes por simetría (mismo
+`canonical_hash`) se descartan dentro de la corrida y contra la BD.
+
+Uso:
+    DATABASE_URL=... python scripts/populate.py --target 500
+    python scripts/populate.py --target 200 --levels HARD EXPERT --workers 4
+    python scripts/populate.py --target 20 --levels GRANDMASTER
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sudoku_api.database import PuzzleDB  # noqa: E402
+from sudoku_api.enums import DifficultyLevel  # noqa: E402
+from sudoku_api.sudoku_game import OptimizedSudokuGameGenerator  # noqa: E402
+
+# Rondas seguidas sin aceptar ningún puzzle antes de rendirse
+MAX_IDLE_ROUNDS = 3
+
+# El generador casi nunca cae en GRANDMASTER: pedirlo con --levels
+DEFAULT_LEVELS = [
+    level for level in DifficultyLevel if level is not DifficultyLevel.GRANDMASTER
+]
+
+
+def _init_worker():
+    # Con fork todos los procesos heredan el mismo estado de random
+    random.seed()
+
+
+def _generate(level_name):
+    level = DifficultyLevel[level_name]
+    game = OptimizedSudokuGameGenerator.generate_puzzle(target_level=level)
+    game.canonical_hash  # se calcula aquí, en el worker
+    return game
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pobla la BD de puzzles")
+    parser.add_argument(
+        "--target", type=int, default=50, help="puzzles por dificultad (default: 50)"
+    )
+    parser.add_argument(
+        "--levels",
+        nargs="+",
+        type=DifficultyLevel.from_string,
+        default=DEFAULT_LEVELS,
+        help="dificultades a poblar (default: todas menos GRANDMASTER)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="procesos generadores"
+    )
+    parser.add_argument(
+        "--batch", type=int, default=500, help="puzzles por COPY (default: 500)"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    db = PuzzleDB()
+
+    def count_missing():
+        existing = db.get_boards()["boards"]
+        return {
+            level.name: max(0, args.target - existing.get(level.name, 0))
+            for level in args.levels
+        }
+
+    missing = count_missing()
+    print(
+        "Faltan: "
+        + ", ".join(f"{name}={count}" for name, count in missing.items())
+    )
+
+    seen = set()
+    pending = []
+    inserted = generated = duplicates = 0
+    idle_rounds = 0
+    start = time.perf_counter()
+
+    def flush():
+        nonlocal inserted, duplicates, missing, pending
+        if not pending:
+            return
+        saved = db.copy_puzzles(pending)
+        inserted += saved
+        if saved < len(pending):
+            # Algunos ya estaban en la BD: volver a contar lo que falta
+            duplicates += len(pending) - saved
+            missing = count_missing()
+        pending = []
+        elapsed = time.perf_counter() - start
+        print(
+            f"  {inserted} guardados | {generated} generados | "
+            f"{generated / elapsed:.1f} puzzles/s | {elapsed:.0f} s"
+        )
+
+    with Pool(args.workers, initializer=_init_worker) as pool:
+        while sum(missing.values()) and idle_rounds < MAX_IDLE_ROUNDS:
+            # El generador puede caer en otro nivel; lo que sobra se descarta
+            # y la siguiente ronda vuelve a pedir lo que falte
+            tasks = [name for name, count in missing.items() for _ in range(count)]
+            random.shuffle(tasks)
+            accepted = 0
+
+            for game in pool.imap_unordered(_generate, tasks, chunksize=4):
+                generated += 1
+                name = game.difficult_level.name
+                if not missing.get(name):
+                    continue
+                key = game.canonical_hash
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                missing[name] -= 1
+                accepted += 1
+                pending.append(game)
+                if len(pending) >= args.batch:
+                    flush()
+
+            flush()
+            idle_rounds = 0 if accepted else idle_rounds + 1
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Listo: {inserted} puzzles en {elapsed:.1f} s "
+        f"({inserted / elapsed if elapsed else 0:.1f} puzzles/s guardados, "
+        f"{generated} generados, {duplicates} duplicados)"
+    )
+    if sum(missing.values()):
+        print(
+            "Sin completar: "
+            + ", ".join(f"{name}={count}" for name, count in missing.items() if count)
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,16 @@ def create_models(api):
         },
     )
 
+    grid_batch_model = api.model(
+        "GridBatch",
+        {
+            "grids": fields.List(
+                fields.Raw,
+                description="9x9 grids or 81-char strings ('0' or '.' = empty cell)",
+            )
+        },
+    )
+
     playable_model = api.model(
         "Playable", 
         {
@@ -53,6 +63,9 @@ def create_models(api):
             "iterations_used": fields.Integer,
             "empty_cells": fields.Integer,
             "cached": fields.Boolean,
+            "variant_seed": fields.Integer(
+                description="SudokuTransform seed applied to the stored puzzle (0 = none)"
+            ),
             "is_daily": fields.Boolean(required=False),
             "date_assigned": fields.String(required=False),
         },
@@ -78,6 +91,7 @@ def create_models(api):
 
     return {
         "grid": grid_model,
+        "grid_batch": grid_batch_model,
         "playable": playable_model,
         "solution": solution_model,
         "difficulty": difficulty_model,
@@ -2,13 +2,16 @@ import os
 import base64
 import json
 import logging
+import threading
 from functools import wraps
 from flask import request, g
+from sudoku_api.firebase_tokens import FirebaseTokenVerifier
 
 logger = logging.getLogger(__name__)
 
 _API_KEY = os.environ.get("API_KEY")
 _firebase_app = None
+_token_verifier = None
 
 
 def _get_firebase_app():
@@ -33,6 +36,39 @@ def _get_firebase_app():
     return _firebase_app
 
 
+def _get_token_verifier():
+    global _token_verifier
+    if _token_verifier is None:
+        _token_verifier = FirebaseTokenVerifier(
+            _get_firebase_app().project_id,
+            max_tokens=int(os.environ.get("FIREBASE_TOKEN_CACHE_SIZE", 10000)),
+        )
+    return _token_verifier
+
+
+def verify_firebase_token(id_token: str) -> dict:
+    """Claims del token. Con el emulador de Auth se delega a firebase_admin."""
+    if os.environ.get("FIREBASE_AUTH_EMULATOR_HOST"):
+        from firebase_admin import auth
+        _get_firebase_app()
+        return auth.verify_id_token(id_token)
+    return _get_token_verifier().verify(id_token)
+
+
+def warm_up_firebase():
+    """Precarga los certificados de Firebase en segundo plano (si hay credenciales)"""
+    if not os.environ.get("FIREBASE_CREDENTIALS"):
+        return
+
+    def run():
+        try:
+            _get_token_verifier().keys.refresh()
+        except Exception:
+            logger.exception("Failed to preload Firebase certificates")
+
+    threading.Thread(target=run, daemon=True).start()
+
+
 def require_api_key(f):
     """Sin-op si API_KEY no está definida en el entorno."""
     @wraps(f)
@@ -58,9 +94,7 @@ def require_firebase_auth(f):
             return {"error": "Missing token"}, 401
 
         try:
-            from firebase_admin import auth
-            _get_firebase_app()
-            decoded = auth.verify_id_token(id_token)
+            decoded = verify_firebase_token(id_token)
             g.firebase_uid = decoded["uid"]
             g.firebase_email = decoded.get("email", "")
             g.firebase_name = decoded.get("name", "")
@@ -0,0 +1,56 @@
+"""Caché en memoria por worker con expiración por entrada y límite LRU"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Diccionario thread-safe con expiración y desalojo LRU.
+
+    Cada entrada vence en `ttl` segundos o en un instante absoluto
+    (`expires_at`, timestamp de time.time()); al superar `max_size` se
+    desaloja la entrada usada hace más tiempo.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None, expires_at: float = None):
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
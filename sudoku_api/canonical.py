@@ -0,0 +1,140 @@
+"""Forma canónica de un puzzle bajo las simetrías del sudoku.
+
+Dos puzzles son equivalentes si uno se obtiene del otro con transposición,
+permutación de bandas/filas y stacks/columnas y relabel de números (ver
+`SudokuTransform`). La forma canónica es idéntica para todos los puzzles de
+una misma clase, así que sirve como clave de deduplicación.
+
+Se canoniza la solución (grilla completa) con minlex y el puzzle se lleva con
+la misma transformación. Si varias transformaciones empatan (solución con
+automorfismos) se toma la menor imagen del puzzle.
+"""
+
+import hashlib
+from itertools import permutations, product
+
+import numpy as np
+
+from sudoku_api.sudoku_board import SudokuBoard
+from sudoku_api.sudoku_solver import OptimizedSudokuSolver
+
+_TRIPLES = list(permutations(range(3)))
+
+# Los 1296 órdenes de columnas: stacks permutados y columnas dentro de cada stack
+COLUMN_ORDERS = np.array(
+    [
+        [stack * 3 + column for stack, inner in zip(stacks, inners) for column in inner]
+        for stacks in _TRIPLES
+        for inners in product(_TRIPLES, repeat=3)
+    ],
+    dtype=np.int64,
+)
+
+# Cada fila se codifica como un entero de 9 dígitos: comparar códigos es
+# comparar filas en orden lexicográfico
+_ROW_WEIGHTS = 10 ** np.arange(8, -1, -1, dtype=np.int64)
+
+# Candidatos: transposición x fila superior x orden de columnas
+_CANDIDATE_TRANSPOSE, _CANDIDATE_TOP, _CANDIDATE_ORDER = (
+    axis.ravel() for axis in np.indices((2, 9, len(COLUMN_ORDERS)))
+)
+_CANDIDATES = np.arange(len(_CANDIDATE_ORDER))[:, None]
+_LABELS = np.arange(1, 10, dtype=np.int64)
+
+# Las otras dos filas de la banda de cada fila superior
+_BAND_MATES = np.array(
+    [[r for r in range(top // 3 * 3, top // 3 * 3 + 3) if r != top] for top in range(9)]
+)
+
+
+def _minlex_candidates(solution_cells):
+    """Candidatos que pueden dar la forma minlex de una grilla completa.
+
+    Al elegir transposición, fila superior y orden de columnas el relabel
+    queda fijo (la fila superior pasa a ser 123456789), y con eso también
+    la segunda fila: la menor de las otras dos filas de la banda. Se evalúan
+    los 2 * 9 * 1296 candidatos solo hasta la segunda fila y se conservan
+    los que empatan con la mínima.
+
+    Retorna (índices de candidatos, grillas permutadas (2, 1296, 9, 9),
+    relabels (N, 10)).
+    """
+    grid = np.frombuffer(bytes(solution_cells), dtype=np.uint8).reshape(9, 9)
+    sources = np.stack([grid, grid.T])
+    # permuted[t, k, i, j] = sources[t, i, COLUMN_ORDERS[k, j]]
+    permuted = sources[:, :, COLUMN_ORDERS].transpose(0, 2, 1, 3)
+
+    transpose, top, order = _CANDIDATE_TRANSPOSE, _CANDIDATE_TOP, _CANDIDATE_ORDER
+    relabels = np.zeros((len(order), 10), dtype=np.int64)
+    relabels[_CANDIDATES, permuted[transpose, order, top]] = _LABELS
+
+    second = None
+    for mate in _BAND_MATES[top].T:
+        row = np.take_along_axis(relabels, permuted[transpose, order, mate], axis=1)
+        codes = row @ _ROW_WEIGHTS
+        second = codes if second is None else np.minimum(second, codes)
+
+    survivors = np.flatnonzero(second == second.min())
+    return survivors, permuted, relabels
+
+
+def _row_order(codes, top):
+    """Orden de filas que produce la clave minlex para esta fila superior"""
+    band = top // 3
+    rest = sorted((r for r in range(band * 3, band * 3 + 3) if r != top), key=codes.__getitem__)
+    bands = sorted(
+        (sorted(range(b * 3, b * 3 + 3), key=codes.__getitem__) for b in range(3) if b != band),
+        key=lambda rows: codes[rows[0]],
+    )
+    return [top, *rest, *bands[0], *bands[1]]
+
+
+def _apply(cells, transpose, row_order, column_order, relabel):
+    grid = np.frombuffer(bytes(cells), dtype=np.uint8).reshape(9, 9).astype(np.int64)
+    if transpose:
+        grid = grid.T
+    return relabel[grid[np.ix_(row_order, column_order)]]
+
+
+def canonical_form(playable: SudokuBoard, solution: SudokuBoard = None) -> str:
+    """Forma canónica del puzzle como string de 81 caracteres.
+
+    `solution` evita resolver el puzzle cuando ya se conoce (p. ej. al
+    generar). Para un tablero completo basta con pasarlo como `playable`.
+    """
+    if solution is None:
+        solution = (
+            playable
+            if not playable.get_empty_cells()
+            else OptimizedSudokuSolver(playable).solve()
+        )
+        if solution is None:
+            raise ValueError("El tablero no tiene solución")
+
+    survivors, permuted, relabels = _minlex_candidates(solution.cells)
+
+    # El resto de la clave (filas 3..9) solo para los que empatan en la segunda
+    best_key, tied = None, []
+    for index in survivors:
+        transpose, top = int(_CANDIDATE_TRANSPOSE[index]), int(_CANDIDATE_TOP[index])
+        order, relabel = _CANDIDATE_ORDER[index], relabels[index]
+        codes = list(relabel[permuted[transpose, order]] @ _ROW_WEIGHTS)
+        row_order = _row_order(codes, top)
+        key = [codes[row] for row in row_order]
+        if best_key is None or key < best_key:
+            best_key, tied = key, []
+        if key == best_key:
+            tied.append((transpose, row_order, COLUMN_ORDERS[order], relabel))
+
+    return min(
+        "".join(map(str, _apply(playable.cells, *candidate).ravel()))
+        for candidate in tied
+    )
+
+
+def canonical_hash(playable: SudokuBoard, solution: SudokuBoard = None) -> int:
+    """Hash de 64 bits (con signo, para BIGINT) de la forma canónica"""
+    digest = hashlib.blake2b(
+        canonical_form(playable, solution).encode("ascii"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
@@ -1,6 +1,18 @@
 """Configuración de la aplicación Flask"""
 
+import os
+
+
 class Config:
     """Configuración general de la aplicación"""
     JSON_SORT_KEYS = False
     RESTX_MASK_SWAGGER = False
+
+    # Rate limiting compartido entre workers, p. ej. local+redis://host:6379
+    # (pre-chequeo local, ver rate_limit_storage). Sin la variable cada
+    # worker cuenta por separado en memoria.
+    RATELIMIT_STORAGE_URI = os.environ.get("RATELIMIT_STORAGE_URI", "memory://")
+    RATELIMIT_STRATEGY = "moving-window"
+    # Si el storage compartido no responde, cada worker sigue limitando en memoria
+    RATELIMIT_IN_MEMORY_FALLBACK_ENABLED = True
+    RATELIMIT_KEY_PREFIX = "sudoku-api"
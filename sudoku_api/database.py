@@ -1,8 +1,121 @@
+import io
 import os
-import random
+from datetime import date, timedelta
 import psycopg2.pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from contextlib import contextmanager
+from sudoku_api.enums import DifficultyLevel
+
+_FROM_DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+# Cada escritura de progreso incrementa `version` (migración 008): los
+# guardados por movimientos se aplican solo sobre la versión que conoce el cliente
+_SAVE_PROGRESS_SQL = """
+    INSERT INTO game_progress
+        (user_id, puzzle_id, variant_seed, current_state, time_elapsed, hints_used,
+         completed, completed_at, version)
+    VALUES (%(user_id)s, %(puzzle_id)s, %(variant_seed)s, %(current_state)s,
+            %(time_elapsed)s, %(hints_used)s, %(completed)s,
+            CASE WHEN %(completed)s THEN NOW() ELSE NULL END, 1)
+    ON CONFLICT (user_id, puzzle_id) DO UPDATE
+      SET variant_seed   = EXCLUDED.variant_seed,
+          current_state  = EXCLUDED.current_state,
+          time_elapsed   = EXCLUDED.time_elapsed,
+          hints_used     = EXCLUDED.hints_used,
+          completed      = EXCLUDED.completed,
+          completed_at   = CASE WHEN EXCLUDED.completed THEN NOW()
+                                ELSE game_progress.completed_at END,
+          version        = game_progress.version + 1
+    RETURNING *
+"""
+
+# Lote de progresos no completados (buffer write-behind): un upsert multi-fila.
+# Un autoguardado atrasado (p. ej. en el buffer de otro worker) no reabre una
+# partida ya completada.
+_SAVE_PROGRESS_BATCH_SQL = """
+    INSERT INTO game_progress
+        (user_id, puzzle_id, variant_seed, current_state, time_elapsed, hints_used,
+         completed, version)
+    VALUES %s
+    ON CONFLICT (user_id, puzzle_id) DO UPDATE
+      SET variant_seed   = EXCLUDED.variant_seed,
+          current_state  = EXCLUDED.current_state,
+          time_elapsed   = EXCLUDED.time_elapsed,
+          hints_used     = EXCLUDED.hints_used,
+          completed      = EXCLUDED.completed,
+          version        = game_progress.version + 1
+    WHERE NOT game_progress.completed
+    RETURNING user_id, puzzle_id, version
+"""
+
+_SAVE_PROGRESS_BATCH_TEMPLATE = (
+    "(%(user_id)s, %(puzzle_id)s, %(variant_seed)s, %(current_state)s,"
+    " %(time_elapsed)s, %(hints_used)s, %(completed)s, 1)"
+)
+
+# Movimientos sobre la versión `base_version`; el SET de cada celda se agrega
+# en apply_progress_moves. Si la versión no coincide no actualiza nada.
+_APPLY_MOVES_SQL = """
+    UPDATE game_progress
+    SET {cells},
+        time_elapsed = %(time_elapsed)s,
+        hints_used   = %(hints_used)s,
+        completed    = %(completed)s,
+        completed_at = CASE WHEN %(completed)s THEN NOW() ELSE completed_at END,
+        version      = version + 1
+    WHERE user_id = %(user_id)s
+      AND puzzle_id = %(puzzle_id)s
+      AND version = %(base_version)s
+    RETURNING *
+"""
+
+_MOVE_SQL = "current_state[%(row{0})s][%(column{0})s] = %(value{0})s"
+
+
+def _with_user_stats(progress_sql: str) -> str:
+    """Progreso + stats en una sentencia.
+
+    Las CTE que modifican datos se ejecutan siempre; `stats` inserta la fila
+    si no existe o la actualiza en el conflicto, y no hace nada si `progress`
+    no escribió (conflicto de versión).
+    """
+    return f"""
+    WITH progress AS ({progress_sql}),
+    puzzle AS (
+        SELECT difficulty FROM puzzles WHERE id = %(puzzle_id)s
+    ),
+    stats AS (
+        INSERT INTO user_stats AS s
+            (user_id, games_played, games_completed, best_times, updated_at)
+        SELECT %(user_id)s, 1, 1,
+               jsonb_build_object(difficulty, %(time_elapsed)s), NOW()
+        FROM puzzle
+        WHERE EXISTS (SELECT 1 FROM progress)
+        ON CONFLICT (user_id) DO UPDATE
+        SET games_played    = s.games_played + 1,
+            games_completed = s.games_completed + 1,
+            best_times      = CASE
+                WHEN s.best_times -> (SELECT difficulty FROM puzzle) IS NULL
+                  OR (s.best_times ->> (SELECT difficulty FROM puzzle))::int
+                     > %(time_elapsed)s
+                THEN s.best_times || EXCLUDED.best_times
+                ELSE s.best_times
+            END,
+            updated_at      = NOW()
+    )
+    SELECT * FROM progress
+"""
+
+
+_COMPLETE_PROGRESS_SQL = _with_user_stats(_SAVE_PROGRESS_SQL)
+
+
+class ProgressConflict(Exception):
+    """`base_version` no coincide con la versión guardada del progreso"""
+
+    def __init__(self, current_version: int | None):
+        super().__init__(f"Progress is at version {current_version}")
+        self.current_version = current_version
 
 
 class PuzzleDB:
@@ -26,64 +139,222 @@ class PuzzleDB:
         finally:
             self._pool.putconn(conn)
 
-    def find_puzzle_by_id(self, puzzle_id: int) -> dict | None:
+    # --- Codificación de grillas ---
+    # Las grillas se guardan como CHAR(81), fila por fila con '0' en las
+    # celdas vacías (migración 006), codificadas con SudokuBoard.to_string.
+    # La API sigue recibiendo listas 9x9.
+
+    @staticmethod
+    def decode_grid(value) -> list:
+        """String de 81 caracteres -> lista 9x9 (las listas se retornan tal cual)"""
+        if not isinstance(value, str):
+            return value
+        cells = value.encode("ascii").translate(_FROM_DIGITS)
+        return [list(cells[start : start + 9]) for start in range(0, 81, 9)]
+
+    @classmethod
+    def _decode_puzzle(cls, row) -> dict | None:
+        if row is None:
+            return None
+        puzzle = dict(row)
+        puzzle["playable_grid"] = cls.decode_grid(puzzle["playable_grid"])
+        puzzle["solution_grid"] = cls.decode_grid(puzzle["solution_grid"])
+        return puzzle
+
+    def find_puzzle(self, difficulty):
+        """Buscar puzzle aleatorio por dificultad en tiempo constante.
+
+        Sortea un seq entre 1 y MAX(seq) y toma el primer puzzle con seq >= al
+        sorteado, así los huecos dejados por borrados caen en el siguiente.
+        Ambos pasos son búsquedas en el índice (difficulty, seq).
+        """
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT * FROM puzzles WHERE id = %s", (puzzle_id,))
-                row = cur.fetchone()
-                return dict(row) if row else None
+                cur.execute(
+                    """
+                    SELECT * FROM puzzles
+                    WHERE difficulty = %(difficulty)s
+                      AND seq >= (
+                          SELECT floor(random() * MAX(seq))::int + 1
+                          FROM puzzles
+                          WHERE difficulty = %(difficulty)s
+                      )
+                    ORDER BY seq
+                    LIMIT 1
+                    """,
+                    {"difficulty": difficulty},
+                )
+                return self._decode_puzzle(cur.fetchone())
 
-    def find_puzzle(self, difficulty):
-        """Buscar puzzle aleatorio por dificultad sin full table scan"""
+    def find_random_puzzles(self, difficulty: str, limit: int) -> list:
+        """Hasta `limit` puzzles aleatorios distintos de una dificultad en un query.
+
+        Sortea `limit` valores de seq y los resuelve por el índice
+        (difficulty, seq); los sorteos repetidos o que caen en huecos se
+        descartan, así que puede retornar menos filas.
+        """
+        if limit <= 0:
+            return []
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
-                    "SELECT COUNT(*) as count FROM puzzles WHERE difficulty = %s",
-                    (difficulty,),
+                    """
+                    SELECT p.* FROM (
+                        SELECT DISTINCT floor(random() * bounds.max_seq)::int + 1 AS seq
+                        FROM (
+                            SELECT MAX(seq) AS max_seq FROM puzzles
+                            WHERE difficulty = %(difficulty)s
+                        ) bounds, generate_series(1, %(limit)s)
+                    ) picks
+                    JOIN puzzles p ON p.difficulty = %(difficulty)s AND p.seq = picks.seq
+                    """,
+                    {"difficulty": difficulty, "limit": limit},
                 )
-                count = cur.fetchone()["count"]
-                if count == 0:
-                    return None
-                offset = random.randint(0, count - 1)
+                return [self._decode_puzzle(row) for row in cur.fetchall()]
+
+    def find_daily_puzzle(self, difficulty: str, day: date):
+        """Puzzle asignado a la fecha y dificultad (ver schedule_daily_puzzles)"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
                 cur.execute(
-                    "SELECT * FROM puzzles WHERE difficulty = %s LIMIT 1 OFFSET %s",
-                    (difficulty, offset),
+                    "SELECT * FROM puzzles WHERE difficulty = %s AND date_assigned = %s",
+                    (difficulty, day),
                 )
-                return cur.fetchone()
+                return self._decode_puzzle(cur.fetchone())
+
+    def schedule_daily_puzzles(self, start: date, days: int) -> int:
+        """Asigna puzzles diarios de `start` a `start + days - 1` para cada dificultad.
+
+        Solo llena las fechas sin asignar, con puzzles nunca usados como diarios
+        elegidos al azar. Si no alcanzan, reutiliza los asignados hace más
+        tiempo (fechas anteriores a `start`), así un banco chico rota en vez de
+        agotarse. Un advisory lock serializa a los workers que intenten
+        programar a la vez. Retorna cuántos puzzles se asignaron.
+        """
+        end = start + timedelta(days=days - 1)
+        assigned = 0
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_xact_lock(hashtext('daily_schedule'))")
+                for level in DifficultyLevel:
+                    cur.execute(
+                        """
+                        WITH days AS (
+                            SELECT d::date AS day, ROW_NUMBER() OVER (ORDER BY d) AS rn
+                            FROM generate_series(%(start)s::date, %(end)s::date, '1 day') d
+                            WHERE NOT EXISTS (
+                                SELECT 1 FROM puzzles
+                                WHERE difficulty = %(difficulty)s AND date_assigned = d::date
+                            )
+                        ),
+                        picks AS (
+                            SELECT id, ROW_NUMBER() OVER () AS rn
+                            FROM (
+                                SELECT id FROM puzzles
+                                WHERE difficulty = %(difficulty)s
+                                  AND (date_assigned IS NULL OR date_assigned < %(start)s)
+                                ORDER BY date_assigned NULLS FIRST, random()
+                                LIMIT (SELECT COUNT(*) FROM days)
+                            ) candidates
+                        )
+                        UPDATE puzzles p
+                        SET date_assigned = days.day
+                        FROM days JOIN picks ON picks.rn = days.rn
+                        WHERE p.id = picks.id
+                        """,
+                        {"start": start, "end": end, "difficulty": level.name},
+                    )
+                    assigned += cur.rowcount
+        return assigned
+
+    # --- Ingesta ---
+
+    @staticmethod
+    def _puzzle_row(game) -> tuple:
+        """Fila (difficulty, empty_cells, playable_grid, solution_grid, coefficient,
+        canonical_hash)"""
+        return (
+            game.difficult_level.name,
+            len(game.playable.get_empty_cells()),
+            game.playable.to_string(),
+            game.solution.to_string(),
+            game.difficult_coefficient,
+            game.canonical_hash,
+        )
+
+    def save_puzzle(self, game) -> int | None:
+        """Guarda un SudokuGame y retorna su id (None si ya hay uno equivalente)"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO puzzles
+                        (difficulty, empty_cells, playable_grid, solution_grid,
+                         coefficient, canonical_hash)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (canonical_hash) DO NOTHING
+                    RETURNING id
+                    """,
+                    self._puzzle_row(game),
+                )
+                row = cur.fetchone()
+                return row["id"] if row else None
+
+    def copy_puzzles(self, games) -> int:
+        """Guarda varios SudokuGame con COPY en una sola transacción.
+
+        COPY llena una tabla temporal y un único INSERT ... SELECT la vuelca
+        en `puzzles`, así los triggers (seq, conteos) corren igual que con
+        inserts normales. Los puzzles equivalentes a uno ya guardado (mismo
+        `canonical_hash`) se omiten. Retorna cuántas filas se insertaron.
+        """
+        buffer = io.StringIO()
+        for row in map(self._puzzle_row, games):
+            buffer.write("\t".join(map(str, row)) + "\n")
+        buffer.seek(0)
 
-    def find_daily_puzzle(self, difficulty: str, day_of_year: int):
-        """Selecciona el puzzle del día de forma determinística por fecha y dificultad"""
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
-                    "SELECT COUNT(*) as count FROM puzzles WHERE difficulty = %s",
-                    (difficulty,),
+                    """
+                    CREATE TEMP TABLE puzzles_staging (
+                        difficulty VARCHAR(20),
+                        empty_cells INTEGER,
+                        playable_grid CHAR(81),
+                        solution_grid CHAR(81),
+                        coefficient FLOAT,
+                        canonical_hash BIGINT
+                    ) ON COMMIT DROP
+                    """
+                )
+                cur.copy_expert(
+                    "COPY puzzles_staging FROM STDIN WITH (FORMAT text)", buffer
                 )
-                count = cur.fetchone()["count"]
-                if count == 0:
-                    return None
-                offset = day_of_year % count
                 cur.execute(
-                    "SELECT * FROM puzzles WHERE difficulty = %s ORDER BY id LIMIT 1 OFFSET %s",
-                    (difficulty, offset),
+                    """
+                    INSERT INTO puzzles
+                        (difficulty, empty_cells, playable_grid, solution_grid,
+                         coefficient, canonical_hash)
+                    SELECT difficulty, empty_cells, playable_grid, solution_grid,
+                           coefficient, canonical_hash
+                    FROM puzzles_staging
+                    ON CONFLICT (canonical_hash) DO NOTHING
+                    """
                 )
-                return cur.fetchone()
+                return cur.rowcount
 
     def get_boards(self):
-        """Obtiene todos los tableros de Sudoku y un mapa de cuántos hay por dificultad"""
+        """Mapa de cuántos puzzles hay por dificultad.
+
+        Lee `puzzle_counts` (mantenida por trigger, ver migración 004) en vez
+        de agregar toda la tabla `puzzles`.
+        """
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT difficulty, COUNT(*) as count FROM puzzles GROUP BY difficulty")
+                cur.execute("SELECT difficulty, count FROM puzzle_counts WHERE count > 0")
                 counts = {row['difficulty']: row['count'] for row in cur.fetchall()}
                 return {"boards": counts}
 
-    def count_all_puzzles(self):
-        """Contar todos los puzzles en BD"""
-        with self.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) as count FROM puzzles")
-                return cur.fetchone()["count"]
-
     # --- Usuarios ---
 
     def get_or_create_user(self, firebase_uid: str, email: str, display_name: str) -> dict:
@@ -121,75 +392,109 @@ class PuzzleDB:
         time_elapsed: int,
         hints_used: int,
         completed: bool,
+        variant_seed: int = 0,
     ) -> dict:
-        """Upsert del progreso de una partida."""
+        """Upsert del progreso de una partida.
+
+        `variant_seed` identifica la variante transformada que se está jugando
+        (ver SudokuTransform.from_seed); `current_state` está en sus coordenadas.
+
+        Si `completed`, la misma sentencia actualiza `user_stats` (partidas,
+        completadas y mejor tiempo por dificultad): un solo round trip y una
+        sola transacción, así progreso y estadísticas nunca quedan desfasados.
+        """
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
-                    """
-                    INSERT INTO game_progress
-                        (user_id, puzzle_id, current_state, time_elapsed, hints_used, completed, completed_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, CASE WHEN %s THEN NOW() ELSE NULL END)
-                    ON CONFLICT (user_id, puzzle_id) DO UPDATE
-                      SET current_state = EXCLUDED.current_state,
-                          time_elapsed   = EXCLUDED.time_elapsed,
-                          hints_used     = EXCLUDED.hints_used,
-                          completed      = EXCLUDED.completed,
-                          completed_at   = CASE WHEN EXCLUDED.completed THEN NOW()
-                                                ELSE game_progress.completed_at END
-                    RETURNING *
-                    """,
-                    (user_id, puzzle_id, current_state, time_elapsed, hints_used, completed, completed),
+                    _COMPLETE_PROGRESS_SQL if completed else _SAVE_PROGRESS_SQL,
+                    {
+                        "user_id": user_id,
+                        "puzzle_id": puzzle_id,
+                        "variant_seed": variant_seed,
+                        "current_state": current_state,
+                        "time_elapsed": time_elapsed,
+                        "hints_used": hints_used,
+                        "completed": completed,
+                    },
                 )
                 return dict(cur.fetchone())
 
-    # --- Estadísticas de usuario ---
+    def apply_progress_moves(
+        self,
+        user_id: str,
+        puzzle_id: int,
+        base_version: int,
+        moves: list,
+        time_elapsed: int,
+        hints_used: int,
+        completed: bool,
+    ) -> dict:
+        """Aplica movimientos `(fila, columna, valor)` (0-index, 0 = borrar).
+
+        Solo escribe si la versión guardada es `base_version`; si no, lanza
+        ProgressConflict con la versión actual (None si no hay progreso). Con
+        `completed` actualiza `user_stats` en la misma sentencia, como
+        save_progress.
+        """
+        params = {
+            "user_id": user_id,
+            "puzzle_id": puzzle_id,
+            "base_version": base_version,
+            "time_elapsed": time_elapsed,
+            "hints_used": hints_used,
+            "completed": completed,
+        }
+        # Una asignación por celda: el último movimiento sobre cada una gana
+        cells = {(row, column): value for row, column, value in moves}
+        for i, ((row, column), value) in enumerate(cells.items()):
+            params[f"row{i}"] = row + 1
+            params[f"column{i}"] = column + 1
+            params[f"value{i}"] = value
+        query = _APPLY_MOVES_SQL.format(
+            cells=",\n        ".join(_MOVE_SQL.format(i) for i in range(len(cells)))
+        )
+        if completed:
+            query = _with_user_stats(query)
 
-    def get_user_stats(self, user_id: str) -> dict | None:
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT * FROM user_stats WHERE user_id = %s", (user_id,))
+                cur.execute(query, params)
                 row = cur.fetchone()
-                return dict(row) if row else None
+                if row is None:
+                    cur.execute(
+                        "SELECT version FROM game_progress WHERE user_id = %s AND puzzle_id = %s",
+                        (user_id, puzzle_id),
+                    )
+                    current = cur.fetchone()
+                    raise ProgressConflict(current["version"] if current else None)
+                return dict(row)
 
-    def update_user_stats(
-        self,
-        user_id: str,
-        completed: bool,
-        difficulty: str,
-        time_seconds: int,
-    ) -> dict:
-        """Actualiza stats tras completar (o guardar) una partida."""
+    def save_progress_batch(self, entries: list) -> dict:
+        """Upsert multi-fila de progresos no completados.
+
+        `entries` son dicts con los argumentos de `save_progress` y a lo sumo
+        uno por (user_id, puzzle_id): Postgres no admite que un mismo
+        INSERT ... ON CONFLICT toque dos veces la misma fila. Retorna
+        {(user_id, puzzle_id): versión} de las filas escritas (las partidas ya
+        completadas no se tocan y no aparecen).
+        """
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO user_stats (user_id) VALUES (%s)
-                    ON CONFLICT (user_id) DO NOTHING
-                    """,
-                    (user_id,),
+                rows = execute_values(
+                    cur,
+                    _SAVE_PROGRESS_BATCH_SQL,
+                    entries,
+                    template=_SAVE_PROGRESS_BATCH_TEMPLATE,
+                    page_size=len(entries),
+                    fetch=True,
                 )
-                cur.execute(
-                    """
-                    UPDATE user_stats
-                    SET games_played    = games_played + 1,
-                        games_completed = games_completed + CASE WHEN %s THEN 1 ELSE 0 END,
-                        best_times      = CASE
-                            WHEN %s AND (
-                                best_times->%s IS NULL
-                                OR (best_times->>%s)::int > %s
-                            )
-                            THEN jsonb_set(best_times, ARRAY[%s], to_jsonb(%s))
-                            ELSE best_times
-                        END,
-                        updated_at      = NOW()
-                    WHERE user_id = %s
-                    RETURNING *
-                    """,
-                    (
-                        completed,
-                        completed, difficulty, difficulty, time_seconds, difficulty, time_seconds,
-                        user_id,
-                    ),
-                )
-                return dict(cur.fetchone())
\ No newline at end of file
+                return {(row["user_id"], row["puzzle_id"]): row["version"] for row in rows}
+
+    # --- Estadísticas de usuario ---
+
+    def get_user_stats(self, user_id: str) -> dict | None:
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT * FROM user_stats WHERE user_id = %s", (user_id,))
+                row = cur.fetchone()
+                return dict(row) if row else None
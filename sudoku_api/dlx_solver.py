@@ -0,0 +1,169 @@
+from sudoku_api.sudoku_board import NUMBERS_BY_MASK, box_index
+
+# Columnas de la matriz de exact cover (324 restricciones):
+#   celda (fila, columna) tiene número | fila tiene n | columna tiene n | caja tiene n
+_CELL_OFFSET = 0
+_ROW_OFFSET = 81
+_COLUMN_OFFSET = 162
+_BOX_OFFSET = 243
+
+
+def _constraint_columns(row_num, column_num, number):
+    n = number - 1
+    return (
+        _CELL_OFFSET + row_num * 9 + column_num,
+        _ROW_OFFSET + row_num * 9 + n,
+        _COLUMN_OFFSET + column_num * 9 + n,
+        _BOX_OFFSET + box_index(row_num, column_num) * 9 + n,
+    )
+
+
+class DLXSolver:
+    """Solver de exact cover (Algorithm X de Knuth) con Dancing Links.
+
+    Los nodos viven en listas planas de enteros (L, R, U, D, C) en lugar de
+    objetos. Las pistas del tablero no generan filas: sus restricciones se
+    eliminan de la matriz al construirla, así que solo quedan candidatos
+    para las celdas vacías.
+    """
+
+    def __init__(self, sudoku_board):
+        self.sudoku_board = sudoku_board
+
+    def find_solutions(self, max_solutions=2):
+        """Retorna hasta `max_solutions` soluciones como SudokuBoard"""
+        if self.sudoku_board.has_conflicts():
+            return []
+
+        self._build()
+        solutions = []
+        self._partial = []
+        self._search(solutions, max_solutions)
+        return solutions
+
+    def _build(self):
+        board = self.sudoku_board
+        satisfied = set()
+        for index, number in enumerate(board.cells):
+            if number:
+                satisfied.update(_constraint_columns(*divmod(index, 9), number))
+
+        # Nodo 0 es la raíz; luego un encabezado por restricción sin satisfacer
+        L, R, U, D, C, S = [0], [0], [0], [0], [0], [0]
+        self._candidates = [None]
+        header_of = {}
+        for constraint in range(324):
+            if constraint in satisfied:
+                continue
+            node = len(L)
+            header_of[constraint] = node
+            L.append(node - 1)
+            R.append(0)
+            R[node - 1] = node
+            L[0] = node
+            U.append(node)
+            D.append(node)
+            C.append(node)
+            S.append(0)
+            self._candidates.append(None)
+
+        for row_num, column_num in board.get_empty_cells():
+            mask = board.get_candidates_mask(row_num, column_num)
+            for number in NUMBERS_BY_MASK[mask]:
+                first = len(L)
+                for constraint in _constraint_columns(row_num, column_num, number):
+                    header = header_of[constraint]
+                    node = len(L)
+                    # Insertar al final de la columna
+                    U.append(U[header])
+                    D.append(header)
+                    D[U[header]] = node
+                    U[header] = node
+                    # Enlazar dentro de la fila (circular)
+                    L.append(node - 1 if node > first else node)
+                    R.append(first)
+                    if node > first:
+                        R[node - 1] = node
+                        L[first] = node
+                    C.append(header)
+                    S.append(0)
+                    S[header] += 1
+                    self._candidates.append((row_num, column_num, number))
+
+        self._L, self._R, self._U, self._D, self._C, self._S = L, R, U, D, C, S
+
+    def _cover(self, header):
+        L, R, U, D, C, S = self._L, self._R, self._U, self._D, self._C, self._S
+        R[L[header]] = R[header]
+        L[R[header]] = L[header]
+        i = D[header]
+        while i != header:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, header):
+        L, R, U, D, C, S = self._L, self._R, self._U, self._D, self._C, self._S
+        i = U[header]
+        while i != header:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[header]] = header
+        L[R[header]] = header
+
+    def _search(self, solutions, max_solutions):
+        R, D, C, S = self._R, self._D, self._C, self._S
+
+        if R[0] == 0:
+            solutions.append(self._to_board())
+            return
+
+        # Columna con menos filas (heurística S de Knuth)
+        header, size = 0, 730
+        column = R[0]
+        while column != 0:
+            if S[column] < size:
+                header, size = column, S[column]
+                if size <= 1:
+                    break
+            column = R[column]
+
+        if size == 0:
+            return
+
+        self._cover(header)
+        row = D[header]
+        while row != header:
+            self._partial.append(row)
+            j = R[row]
+            while j != row:
+                self._cover(C[j])
+                j = R[j]
+
+            self._search(solutions, max_solutions)
+
+            j = self._L[row]
+            while j != row:
+                self._uncover(C[j])
+                j = self._L[j]
+            self._partial.pop()
+
+            if len(solutions) >= max_solutions:
+                break
+            row = D[row]
+        self._uncover(header)
+
+    def _to_board(self):
+        board = self.sudoku_board.clone()
+        for node in self._partial:
+            board.assign(*self._candidates[node])
+        return board
@@ -43,3 +43,15 @@ class DifficultyLevel(enum.Enum):
 
     def __str__(self) -> str:
         return self.name
+
+
+class SolverBackend(enum.Enum):
+    MRV = "mrv"  # Backtracking con heurística MRV
+    DLX = "dlx"  # Exact cover (Algorithm X) con Dancing Links
+
+    @classmethod
+    def get_default(cls) -> 'SolverBackend':
+        return cls.MRV
+
+    def __str__(self) -> str:
+        return self.value
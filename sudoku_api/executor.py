@@ -0,0 +1,131 @@
+"""Pool de procesos para el trabajo CPU-bound del solver y el generador.
+
+Con workers gevent, resolver un sudoku dentro del request bloquea el event
+loop de todo el worker. Este módulo delega esas llamadas a procesos aparte
+con cola acotada y timeout por tarea. Con SOLVER_WORKERS=0 (default) las
+tareas corren en línea, como antes.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from sudoku_api.sudoku_board import SudokuBoard
+from sudoku_api.sudoku_solver import OptimizedSudokuSolver
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(Exception):
+    """La cola del pool está llena: el cliente debe reintentar más tarde"""
+
+
+class TaskTimeout(Exception):
+    """La tarea no terminó dentro del tiempo máximo"""
+
+
+class SolverExecutor:
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def run(self, fn, *args):
+        """Ejecuta fn(*args) en el pool y espera el resultado.
+
+        Lanza ExecutorSaturated si ya hay `max_pending` tareas en curso y
+        TaskTimeout si la tarea supera `timeout`. Una tarea vencida conserva
+        su cupo hasta que el proceso termina, así la cola refleja la carga real.
+        """
+        if not self.workers:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorSaturated()
+
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._reset_pool()
+            raise
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TaskTimeout()
+        except BrokenProcessPool:
+            self._reset_pool()
+            raise
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            if self._pool is not None:
+                logger.warning("Solver process pool broken, recreating")
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+solver_executor = None
+
+
+def get_executor():
+    global solver_executor
+    if solver_executor is None:
+        workers = int(os.environ.get("SOLVER_WORKERS", 0))
+        solver_executor = SolverExecutor(
+            workers=workers,
+            max_pending=int(os.environ.get("SOLVER_MAX_PENDING", max(1, workers * 4))),
+            timeout=float(os.environ.get("SOLVER_TIMEOUT", 10)),
+        )
+    return solver_executor
+
+
+# --- Tareas (funciones de módulo para poder enviarlas a otro proceso) ---
+
+
+def solve_grid(grid):
+    """Resuelve un grid 9x9. Retorna (solved_grid, coeficiente de dificultad)"""
+    solver = OptimizedSudokuSolver(SudokuBoard(grid))
+    solution = solver.solve()
+    return solution.grid, solver.improved_coefficient
+
+
+def solve_grids(grids):
+    """Resuelve varios grids; un error por grid no interrumpe al resto"""
+    results = []
+    for grid in grids:
+        try:
+            solved_grid, coefficient = solve_grid(grid)
+        except Exception as e:
+            results.append({"error": str(e)})
+            continue
+        results.append(
+            {
+                "solved_grid": solved_grid,
+                "difficulty_coefficient": round(coefficient, 2),
+            }
+        )
+    return results
@@ -1,4 +1,7 @@
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
+# Registra los esquemas `local+...` de RATELIMIT_STORAGE_URI en limits
+import sudoku_api.rate_limit_storage  # noqa: F401
+
 limiter = Limiter(key_func=get_remote_address)
@@ -0,0 +1,153 @@
+"""Verificación local de Firebase ID tokens con caché de tokens y de certificados.
+
+`firebase_admin.auth.verify_id_token` valida la firma en cada llamada y
+consulta los certificados de Google. Aquí:
+
+- Los tokens ya verificados se guardan por hash (sha256) hasta su `exp`,
+  así que el mismo token repetido (p. ej. el autoguardado de progreso) no
+  vuelve a tocar criptografía.
+- Los certificados públicos se mantienen en memoria según el `max-age` que
+  indica Google y se refrescan en segundo plano antes de vencer. Un `kid`
+  desconocido (rotación de claves) fuerza un refresco inmediato.
+
+Las validaciones de claims son las mismas de firebase_admin: RS256 con
+`kid`, `aud` = project id, `iss` = securetoken y `sub` no vacío.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+
+import google.auth.exceptions
+import google.auth.transport.requests
+from google.auth import jwt
+
+from sudoku_api.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/"
+    "securetoken@system.gserviceaccount.com"
+)
+ISSUER_PREFIX = "https://securetoken.google.com/"
+
+# Vigencia de los certificados si Google no envía max-age
+DEFAULT_CERTS_TTL = 3600
+# Margen antes del vencimiento en que se refrescan en segundo plano
+CERTS_REFRESH_MARGIN = 300
+# Mínimo entre refrescos forzados por un kid desconocido (tokens basura no
+# deben convertirse en un request a Google cada uno)
+CERTS_MIN_REFRESH_INTERVAL = 60
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class InvalidTokenError(ValueError):
+    """El token no es un Firebase ID token válido para este proyecto"""
+
+
+class PublicKeyCache:
+    """Certificados de Google (kid -> PEM) en memoria con refresco anticipado"""
+
+    def __init__(self, url: str = CERTS_URL):
+        self.url = url
+        self._certs = {}
+        self._expires_at = 0.0
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self) -> dict:
+        now = time.time()
+        if now >= self._expires_at:
+            self.refresh()
+        elif now >= self._expires_at - CERTS_REFRESH_MARGIN:
+            self._refresh_in_background()
+        return self._certs
+
+    def refresh(self):
+        with self._lock:
+            response = google.auth.transport.requests.Request()(self.url, method="GET")
+            if response.status != 200:
+                raise google.auth.exceptions.TransportError(
+                    f"Could not fetch certificates at {self.url}: {response.status}"
+                )
+            match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+            ttl = int(match.group(1)) if match else DEFAULT_CERTS_TTL
+            self._certs = json.loads(response.data)
+            self._refreshed_at = time.time()
+            self._expires_at = self._refreshed_at + ttl
+
+    def refresh_if_stale(self):
+        """Refresca salvo que se haya hecho hace menos de CERTS_MIN_REFRESH_INTERVAL"""
+        if time.time() - self._refreshed_at >= CERTS_MIN_REFRESH_INTERVAL:
+            self.refresh()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh Firebase certificates")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+class FirebaseTokenVerifier:
+    def __init__(self, project_id: str, keys: PublicKeyCache = None, max_tokens: int = 10000):
+        if not project_id:
+            raise EnvironmentError("No se pudo determinar el project id de Firebase")
+        self.project_id = project_id
+        self.keys = keys or PublicKeyCache()
+        self._tokens = TTLCache(max_size=max_tokens)
+
+    def verify(self, id_token: str) -> dict:
+        """Retorna los claims del token (con `uid`) o lanza InvalidTokenError"""
+        key = hashlib.sha256(id_token.encode("utf-8")).digest()
+        claims = self._tokens.get(key)
+        if claims is not None:
+            return claims
+
+        claims = self._verify(id_token)
+        self._tokens.set(key, claims, expires_at=claims["exp"])
+        return claims
+
+    def _verify(self, id_token: str) -> dict:
+        try:
+            header = jwt.decode_header(id_token)
+        except ValueError as e:
+            raise InvalidTokenError(str(e)) from e
+
+        if header.get("alg") != "RS256" or not header.get("kid"):
+            raise InvalidTokenError("Token must be RS256 with a kid header")
+
+        certs = self.keys.get()
+        if header["kid"] not in certs:
+            # Claves rotadas: el token puede venir firmado con una nueva
+            self.keys.refresh_if_stale()
+            certs = self.keys.get()
+
+        try:
+            claims = jwt.decode(id_token, certs=certs, audience=self.project_id)
+        except ValueError as e:
+            raise InvalidTokenError(str(e)) from e
+
+        subject = claims.get("sub")
+        if claims.get("iss") != ISSUER_PREFIX + self.project_id:
+            raise InvalidTokenError("Token has incorrect issuer")
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise InvalidTokenError("Token has an invalid subject")
+
+        claims["uid"] = subject
+        return claims
@@ -0,0 +1,58 @@
+"""Caché HTTP para respuestas públicas: ETag fuerte, Cache-Control y 304"""
+
+import hashlib
+import json
+import time
+
+from flask import Response, request
+from werkzeug.http import http_date
+
+from sudoku_api.serialization import json_response
+
+
+def compute_etag(payload) -> str:
+    """ETag fuerte (sin comillas) derivado del contenido del payload.
+
+    Con bytes (respuesta ya serializada) se usa el cuerpo exacto.
+    """
+    if isinstance(payload, bytes):
+        body = payload
+    else:
+        body = json.dumps(
+            payload, sort_keys=True, separators=(",", ":"), default=str
+        ).encode()
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def cached_response(payload, max_age: int = None, expires_at: float = None):
+    """Retorna `payload` con cabeceras de caché o un 304 si el cliente ya lo tiene.
+
+    `payload` puede ser un dict (lo serializa Flask-RESTX) o bytes JSON ya
+    codificados, que se envían tal cual.
+
+    Con `expires_at` (timestamp) la vigencia termina en ese instante, p. ej. el
+    cambio de día del puzzle diario; si no, dura `max_age` segundos. El ETag
+    depende solo del contenido, así que todos los workers (y el CDN) coinciden.
+    """
+    now = time.time()
+    if expires_at is None:
+        expires_at = now + max_age
+    max_age = max(0, int(expires_at - now))
+
+    etag = compute_etag(payload)
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": f"public, max-age={max_age}",
+        "Expires": http_date(expires_at),
+    }
+
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=headers)
+    if isinstance(payload, bytes):
+        return json_response(payload, headers=headers)
+    return payload, 200, headers
+
+
+def charges_rate_limit(response) -> bool:
+    """Para `deduct_when` del limiter: un 304 no consume cuota"""
+    return response.status_code != 304
@@ -35,7 +35,7 @@ class FastDifficultyCalculator:
         constrained_cells = 0
 
         for row, col in self.empty_cells:
-            options = len(self.board.get_available_numbers(row, col))
+            options = self.board.count_available_numbers(row, col)
             option_counts.append(options)
 
             # Celdas muy restringidas (1-2 opciones) son más fáciles
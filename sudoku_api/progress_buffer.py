@@ -0,0 +1,228 @@
+"""Buffer write-behind para el autoguardado de progreso (/api/progress/save)"""
+
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from sudoku_api.cache import TTLCache
+from sudoku_api.database import ProgressConflict
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressBuffer:
+    """Último estado por (user_id, puzzle_id) en memoria, escrito en lote.
+
+    Los clientes autoguardan cada pocos segundos; solo importa el estado más
+    reciente de cada partida. `save` reemplaza el pendiente de esa partida y
+    un hilo lo escribe cada `flush_interval` segundos (o antes, al llegar a
+    `max_pending` partidas) con un único upsert multi-fila.
+
+    Una partida completada se escribe en el momento (junto con las stats) y
+    descarta su pendiente; los guardados por movimientos también. Solo se
+    ordenan las escrituras de una misma partida: un lock por partida y, si
+    su pendiente está en un lote en vuelo, se espera a que ese lote termine.
+    Ningún lock global se mantiene durante un round trip a la BD (el upsert
+    del lote tampoco pisa una partida ya completada). Si el lote falla, sus
+    entradas vuelven al buffer salvo que ya haya una más nueva.
+
+    Para los guardados por movimientos se recuerda la última versión escrita
+    de cada partida: un guardado en buffer responde con la versión que dejará
+    el próximo lote (un lote sube la versión una sola vez). La primera
+    escritura de una partida en este worker, o la siguiente a un conflicto,
+    va directo a la BD para conocer la versión real.
+    """
+
+    def __init__(
+        self,
+        get_db,
+        flush_interval: float = 5.0,
+        max_pending: int = 500,
+        max_versions: int = 10000,
+    ):
+        self._get_db = get_db
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = {}
+        self._versions = TTLCache(max_size=max_versions)
+        self._lock = threading.Lock()
+        # Solo entre flushes: dos lotes con la misma partida no se cruzan
+        self._flush_lock = threading.Lock()
+        # (user_id, puzzle_id) -> [lock, usuarios]; se borra al quedar libre
+        self._key_locks = {}
+        # (user_id, puzzle_id) -> Event del lote en vuelo que la contiene
+        self._inflight = {}
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._saves = 0
+        self._rows_written = 0
+        self._flushes = 0
+        self._flush_errors = 0
+
+    def save(self, **progress) -> dict:
+        """Guarda el progreso; retorna la fila escrita o la entrada pendiente"""
+        key = (progress["user_id"], progress["puzzle_id"])
+        with self._lock:
+            known = None if progress["completed"] else self._versions.get(key)
+            if known is not None:
+                self._pending[key] = progress
+                self._saves += 1
+                full = len(self._pending) >= self.max_pending
+        if known is None:
+            return self._write_through(key, progress)
+
+        self._ensure_thread()
+        if full:
+            self._wakeup.set()
+        return {**progress, "completed_at": None, "version": known + 1}
+
+    def _write_through(self, key, progress) -> dict:
+        with self._key_lock(key):
+            self._take_pending(key)
+            row = self._get_db().save_progress(**progress)
+            with self._lock:
+                self._versions.set(key, row["version"])
+                self._saves += 1
+                self._rows_written += 1
+        return row
+
+    @contextmanager
+    def _key_lock(self, key):
+        """Serializa las escrituras directas de una misma partida"""
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._key_locks[key]
+
+    def _take_pending(self, key):
+        """Saca el pendiente de la partida, esperando el lote en vuelo que la tenga"""
+        while True:
+            with self._lock:
+                flushing = self._inflight.get(key)
+                if flushing is None:
+                    return self._pending.pop(key, None)
+            flushing.wait()
+
+    def apply_moves(self, **moves) -> dict:
+        """Guardado por movimientos: se escribe en el momento.
+
+        Los movimientos se aplican sobre el estado de la BD, así que antes se
+        escribe el pendiente de esa partida (si lo hay); su versión es la que
+        se anunció al guardarlo. Ante ProgressConflict se olvida la versión,
+        y el `current_state` completo que reenvíe el cliente va directo a la BD.
+        """
+        key = (moves["user_id"], moves["puzzle_id"])
+        with self._key_lock(key):
+            pending = self._take_pending(key)
+            db = self._get_db()
+            try:
+                if pending is not None:
+                    try:
+                        db.save_progress_batch([pending])
+                    except Exception:
+                        with self._lock:
+                            self._pending.setdefault(key, pending)
+                        raise
+                row = db.apply_progress_moves(**moves)
+            except ProgressConflict:
+                with self._lock:
+                    self._versions.pop(key)
+                raise
+            with self._lock:
+                self._versions.set(key, row["version"])
+                self._saves += 1
+                self._rows_written += 1 + (pending is not None)
+        return row
+
+    def flush(self) -> int:
+        """Escribe todo lo pendiente; retorna las filas enviadas"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                if not batch:
+                    return 0
+                done = threading.Event()
+                for key in batch:
+                    self._inflight[key] = done
+                    # Los guardados que lleguen durante la escritura ya van
+                    # sobre la versión que deja este lote
+                    known = self._versions.get(key)
+                    if known is not None:
+                        self._versions.set(key, known + 1)
+            try:
+                written = self._get_db().save_progress_batch(list(batch.values()))
+            except Exception:
+                with self._lock:
+                    for key, progress in batch.items():
+                        self._pending.setdefault(key, progress)
+                        self._versions.pop(key)
+                    self._flush_errors += 1
+                raise
+            else:
+                with self._lock:
+                    for key in batch:
+                        if key in written:
+                            self._versions.set(key, written[key])
+                        else:
+                            # Partida ya completada: no se escribió
+                            self._versions.pop(key)
+                    self._flushes += 1
+                    self._rows_written += len(batch)
+            finally:
+                with self._lock:
+                    for key in batch:
+                        del self._inflight[key]
+                done.set()
+            return len(batch)
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self._flush_logged)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._flush_logged()
+
+    def _flush_logged(self):
+        start = time.perf_counter()
+        try:
+            rows = self.flush()
+        except Exception:
+            logger.exception("Failed to flush buffered progress")
+            return
+        if rows:
+            logger.debug(
+                "Flushed %d buffered progress rows in %.1f ms",
+                rows,
+                (time.perf_counter() - start) * 1000,
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "saves": self._saves,
+                "rows_written": self._rows_written,
+                "coalesce_ratio": (
+                    round(self._saves / self._rows_written, 1) if self._rows_written else None
+                ),
+                "flushes": self._flushes,
+                "flush_errors": self._flush_errors,
+            }
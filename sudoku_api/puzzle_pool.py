@@ -0,0 +1,104 @@
+"""Reserva en memoria de puzzles por dificultad para /api/game"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class PuzzlePool:
+    """Reserva de puzzles por dificultad, rellenada en lote en segundo plano.
+
+    `get` sirve desde memoria sin ir a la BD. Cuando una reserva baja de
+    `low_watermark` se lanza un relleno en un hilo aparte que trae hasta
+    `high_watermark` puzzles con un solo query. Si la reserva está vacía se
+    cae a `find_puzzle` directo, así un pool frío nunca deja sin respuesta.
+    """
+
+    def __init__(self, get_db, low_watermark: int = 50, high_watermark: int = 200):
+        self._get_db = get_db
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self._reservoirs = {}
+        self._refilling = set()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._refills = 0
+        self._refill_errors = 0
+        self._refill_seconds = 0.0
+        self._last_refill_seconds = None
+
+    def get(self, difficulty: str):
+        if not self.high_watermark:
+            return self._get_db().find_puzzle(difficulty)
+
+        with self._lock:
+            reservoir = self._reservoirs.setdefault(difficulty, deque())
+            puzzle = reservoir.popleft() if reservoir else None
+            if puzzle is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            needs_refill = len(reservoir) < self.low_watermark
+
+        if needs_refill:
+            self._schedule_refill(difficulty)
+
+        if puzzle is None:
+            puzzle = self._get_db().find_puzzle(difficulty)
+        return puzzle
+
+    def _schedule_refill(self, difficulty):
+        with self._lock:
+            if difficulty in self._refilling:
+                return
+            self._refilling.add(difficulty)
+
+        threading.Thread(target=self._refill, args=(difficulty,), daemon=True).start()
+
+    def _refill(self, difficulty):
+        start = time.perf_counter()
+        puzzles = None
+        try:
+            with self._lock:
+                missing = self.high_watermark - len(self._reservoirs[difficulty])
+            puzzles = self._get_db().find_random_puzzles(difficulty, missing)
+        except Exception:
+            logger.exception("Failed to refill puzzle pool for %s", difficulty)
+        elapsed = time.perf_counter() - start
+        # Contadores y fin del relleno juntos: stats() nunca muestra un relleno
+        # terminado que todavía impida programar el siguiente
+        with self._lock:
+            if puzzles is None:
+                self._refill_errors += 1
+            else:
+                self._reservoirs[difficulty].extend(puzzles)
+                self._refills += 1
+            self._refill_seconds += elapsed
+            self._last_refill_seconds = elapsed
+            self._refilling.discard(difficulty)
+        logger.debug("Puzzle pool refill for %s took %.1f ms", difficulty, elapsed * 1000)
+
+    def stats(self) -> dict:
+        with self._lock:
+            served = self._hits + self._misses
+            attempts = self._refills + self._refill_errors
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / served, 3) if served else None,
+                "refills": self._refills,
+                "refill_errors": self._refill_errors,
+                "avg_refill_ms": (
+                    round(self._refill_seconds / attempts * 1000, 1) if attempts else None
+                ),
+                "last_refill_ms": (
+                    round(self._last_refill_seconds * 1000, 1)
+                    if self._last_refill_seconds is not None
+                    else None
+                ),
+                "sizes": {name: len(r) for name, r in self._reservoirs.items()},
+            }
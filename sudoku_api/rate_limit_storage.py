@@ -0,0 +1,87 @@
+"""Storage de flask-limiter compartido con pre-chequeo local por worker.
+
+`local+<uri>` (p. ej. `local+redis://host:6379`) envuelve el storage de
+`<uri>` para la estrategia moving-window. Cuando el storage compartido
+rechaza un hit, el worker anota hasta cuándo esa clave seguirá llena (inicio
+de la ventana + expiración) y rechaza localmente, sin ir a Redis, los hits
+siguientes de la ráfaga.
+
+Es exacto, no una aproximación: en moving-window un hit rechazado no se
+registra, así que una ventana llena solo se libera cuando vence su entrada
+más antigua, sin importar qué hagan los demás workers.
+"""
+
+from limits.storage import MovingWindowSupport, Storage, storage_from_string
+
+from sudoku_api.cache import TTLCache
+
+LOCAL_PREFIX = "local+"
+
+
+class LocallyCheckedStorage(Storage, MovingWindowSupport):
+    STORAGE_SCHEME = [
+        "local+memory",
+        "local+redis",
+        "local+rediss",
+        "local+redis+unix",
+        "local+redis+cluster",
+        "local+redis+sentinel",
+        "local+valkey",
+        "local+valkeys",
+        "local+valkey+unix",
+    ]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.shared = storage_from_string(
+            uri[len(LOCAL_PREFIX) :], wrap_exceptions=wrap_exceptions, **options
+        )
+        if not isinstance(self.shared, MovingWindowSupport):
+            raise ValueError(f"{uri} no soporta la estrategia moving-window")
+        # clave del límite -> (inicio de la ventana, expiración), hasta que se libere
+        self._blocked = TTLCache(max_size=10000)
+        self.local_rejections = 0
+
+    @property
+    def base_exceptions(self):
+        return self.shared.base_exceptions
+
+    def acquire_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if self._blocked.get(key) is not None:
+            self.local_rejections += 1
+            return False
+        if self.shared.acquire_entry(key, limit, expiry, amount):
+            return True
+        start, count = self.shared.get_moving_window(key, limit, expiry)
+        if count >= limit:
+            self._blocked.set(key, (start, expiry), expires_at=start + expiry)
+        return False
+
+    def get_moving_window(self, key: str, limit: int, expiry: int) -> tuple[float, int]:
+        blocked = self._blocked.get(key)
+        if blocked is not None:
+            return blocked[0], limit
+        return self.shared.get_moving_window(key, limit, expiry)
+
+    def incr(self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1) -> int:
+        return self.shared.incr(key, expiry, elastic_expiry=elastic_expiry, amount=amount)
+
+    def get(self, key: str) -> int:
+        return self.shared.get(key)
+
+    def get_expiry(self, key: str) -> float:
+        blocked = self._blocked.get(key)
+        if blocked is not None:
+            return sum(blocked)
+        return self.shared.get_expiry(key)
+
+    def check(self) -> bool:
+        return self.shared.check()
+
+    def reset(self):
+        self._blocked.clear()
+        return self.shared.reset()
+
+    def clear(self, key: str) -> None:
+        self._blocked.pop(key)
+        self.shared.clear(key)
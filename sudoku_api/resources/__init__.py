@@ -1,8 +1,13 @@
+import os
 from flask_restx import Resource
 from sudoku_api.database import PuzzleDB
+from sudoku_api.progress_buffer import ProgressBuffer
+from sudoku_api.puzzle_pool import PuzzlePool
 
 
 puzzle_db = None
+puzzle_pool = None
+progress_buffer = None
 
 
 def get_db():
@@ -10,3 +15,27 @@ def get_db():
     if puzzle_db is None:
         puzzle_db = PuzzleDB()
     return puzzle_db
+
+
+def get_pool():
+    global puzzle_pool
+    if puzzle_pool is None:
+        puzzle_pool = PuzzlePool(
+            get_db,
+            low_watermark=int(os.environ.get("PUZZLE_POOL_LOW", 50)),
+            high_watermark=int(os.environ.get("PUZZLE_POOL_SIZE", 200)),
+        )
+    return puzzle_pool
+
+
+def get_progress_buffer():
+    """Buffer write-behind de progreso, o None si PROGRESS_BUFFER_INTERVAL es 0"""
+    global progress_buffer
+    interval = float(os.environ.get("PROGRESS_BUFFER_INTERVAL", 0))
+    if progress_buffer is None and interval > 0:
+        progress_buffer = ProgressBuffer(
+            get_db,
+            flush_interval=interval,
+            max_pending=int(os.environ.get("PROGRESS_BUFFER_SIZE", 500)),
+        )
+    return progress_buffer
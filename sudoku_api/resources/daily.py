@@ -1,21 +1,41 @@
+import hashlib
 import logging
-from datetime import date
+from datetime import date, datetime, time, timedelta
 from flask_restx import Resource
 from flask import request
+from sudoku_api.cache import TTLCache
 from sudoku_api.extensions import limiter
+from sudoku_api.http_cache import cached_response, charges_rate_limit
 from sudoku_api.resources import get_db
 from sudoku_api.enums import DifficultyLevel
+from sudoku_api.serialization import cached_puzzle_body
+from sudoku_api.transforms import MAX_VARIANT_SEED
 
 logger = logging.getLogger(__name__)
 
+# Días que se programan por adelantado cuando falta el puzzle del día
+SCHEDULE_DAYS_AHEAD = 30
+
+# (dificultad, fecha) -> fila del puzzle (o _NO_PUZZLE), vigente hasta la medianoche
+_daily_cache = TTLCache(max_size=64)
+_NO_PUZZLE = object()
+
+
+def next_midnight(today: date) -> datetime:
+    return datetime.combine(today + timedelta(days=1), time.min)
+
+
+def daily_variant_seed(difficulty: str, day: date) -> int:
+    """Semilla de la variante del día: igual para todos y reproducible"""
+    digest = hashlib.blake2b(f"{difficulty}:{day}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % MAX_VARIANT_SEED + 1
+
 
 class DailyPuzzleResource(Resource):
-    @limiter.limit("3/minute")
+    @limiter.limit("3/minute", deduct_when=charges_rate_limit)
     def get(self):
         try:
-            db = get_db()
             today = date.today()
-            day_of_year = today.timetuple().tm_yday
 
             difficulty_input = request.args.get("difficulty", None, type=str)
             difficulty_level = (
@@ -24,42 +44,40 @@ class DailyPuzzleResource(Resource):
                 else DifficultyLevel.get_default()
             )
 
-            puzzle = db.find_daily_puzzle(difficulty_level.name, day_of_year)
+            puzzle = self._get_daily_puzzle(difficulty_level.name, today)
 
             if not puzzle:
                 return {"error": "No hay puzzle diario para este nivel"}, 404
-            empty_cells = self._get_empty_cells(puzzle["playable_grid"])
-
-            return {
-                "success": True,
-                "data": {
-                    "playable": {
-                        "grid": puzzle["playable_grid"],
-                        "is_valid": False,
-                    },
-                    "solution": {
-                        "grid": puzzle["solution_grid"],
-                        "is_valid": True,
-                    },
-                    "difficulty": {
-                        "level": difficulty_level.name,
-                        "coefficient": round(puzzle["coefficient"], 2),
-                    },
-                    "metadata": {
-                        "puzzle_id": puzzle["id"],
-                        "empty_cells": len(empty_cells),
-                        "cached": True,
-                        "is_daily": True,
-                        "date_assigned": str(today),
-                        "hints_coordinates": [[r, c] for r, c in empty_cells],
-                    },
-                },
-            }, 200
+
+            # Variante derivada de la fecha: un puzzle repetido en el
+            # calendario no se ve igual
+            variant_seed = daily_variant_seed(difficulty_level.name, today)
+            body = cached_puzzle_body(puzzle, variant_seed, day=today)
+
+            # Igual para todos hasta el cambio de día: lo absorben CDN y clientes
+            return cached_response(body, expires_at=next_midnight(today).timestamp())
 
         except Exception:
             logger.exception("Failed to get daily puzzle")
             return {"error": "Failed to get daily puzzle"}, 500
 
     @staticmethod
-    def _get_empty_cells(grid):
-        return [(i, j) for i in range(9) for j in range(9) if grid[i][j] == 0]
\ No newline at end of file
+    def _get_daily_puzzle(difficulty, today):
+        key = (difficulty, today)
+        puzzle = _daily_cache.get(key)
+        if puzzle is not None:
+            return None if puzzle is _NO_PUZZLE else puzzle
+
+        db = get_db()
+        puzzle = db.find_daily_puzzle(difficulty, today)
+        if puzzle is None:
+            db.schedule_daily_puzzles(today, SCHEDULE_DAYS_AHEAD)
+            puzzle = db.find_daily_puzzle(difficulty, today)
+
+        # Un nivel sin puzzles no vuelve a programar en cada request
+        _daily_cache.set(
+            key,
+            _NO_PUZZLE if puzzle is None else puzzle,
+            expires_at=next_midnight(today).timestamp(),
+        )
+        return puzzle
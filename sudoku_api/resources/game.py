@@ -1,9 +1,12 @@
 import logging
+import random
 from flask_restx import Resource
 from flask import request
 from sudoku_api.extensions import limiter
-from sudoku_api.resources import get_db
+from sudoku_api.resources import get_pool
 from sudoku_api.enums import DifficultyLevel
+from sudoku_api.serialization import cached_puzzle_body, encode_puzzle, json_response
+from sudoku_api.transforms import MAX_VARIANT_SEED
 
 logger = logging.getLogger(__name__)
 
@@ -22,43 +25,21 @@ class GameResource(Resource):
     @limiter.limit("5/minute")
     def get(self):
         try:
-            db = get_db()
             difficulty_input = request.args.get("difficulty", None, type=str)
 
             difficulty_level = GameResource._get_difficulty_level(difficulty_input)
-            cached_puzzle = db.find_puzzle(difficulty_level.name)
+            cached_puzzle = get_pool().get(difficulty_level.name)
 
-            empty_cells = self._get_empty_cells(cached_puzzle["playable_grid"])
-            hints = [[r, c] for r, c in empty_cells]
+            # variant=true: misma dificultad, aspecto distinto, sin resolver nada.
+            # Cada variante es única, así que solo el original reutiliza bytes
+            if request.args.get("variant", "").lower() in ("1", "true"):
+                variant_seed = random.randint(1, MAX_VARIANT_SEED)
+                body = encode_puzzle(cached_puzzle, variant_seed)
+            else:
+                body = cached_puzzle_body(cached_puzzle)
 
-            return {
-                "success": True,
-                "data": {
-                    "playable": {
-                        "grid": cached_puzzle["playable_grid"],
-                        "is_valid": False,
-                    },
-                    "solution": {
-                        "grid": cached_puzzle["solution_grid"],
-                        "is_valid": True,
-                    },
-                    "difficulty": {
-                        "level": difficulty_level.name,
-                        "coefficient": round(cached_puzzle["coefficient"], 2),
-                    },
-                    "metadata": {
-                        "puzzle_id": cached_puzzle["id"],
-                        "empty_cells": len(empty_cells),
-                        "cached": True,
-                        "hints_coordinates": hints,
-                    },
-                },
-            }, 200
+            return json_response(body)
 
         except Exception:
             logger.exception("Failed to generate game")
             return {"error": "Failed to generate game"}, 500
-
-    @staticmethod
-    def _get_empty_cells(grid):
-        return [(i, j) for i in range(9) for j in range(9) if grid[i][j] == 0]
@@ -1,11 +1,15 @@
 from flask_restx import Resource
+from sudoku_api.resources import get_pool, get_progress_buffer
 
 
 class HealthResource(Resource):
     def get(self):
         """Health check endpoint"""
+        buffer = get_progress_buffer()
         return {
             "status": "ok",
             "service": "sudoku-api",
-            "version": "2.0.0"
+            "version": "2.0.0",
+            "puzzle_pool": get_pool().stats(),
+            "progress_buffer": buffer.stats() if buffer is not None else None,
         }, 200
@@ -3,12 +3,21 @@ from flask_restx import Resource
 from flask import request
 from sudoku_api.extensions import limiter
 from sudoku_api.auth import require_api_key
+from sudoku_api.executor import (
+    ExecutorSaturated,
+    TaskTimeout,
+    get_executor,
+    solve_grid,
+    solve_grids,
+)
 from sudoku_api.sudoku_board import SudokuBoard
-from sudoku_api.sudoku_solver import OptimizedSudokuSolver
-from sudoku_api.validator import validate_grid_format
+from sudoku_api.validator import normalize_grid, validate_grid_format
 
 logger = logging.getLogger(__name__)
 
+SOLVER_BUSY = ({"error": "Solver busy, retry later"}, 503, {"Retry-After": "1"})
+SOLVER_TIMEOUT = ({"error": "Solver timeout"}, 504)
+
 
 class SolveResource(Resource):
     @limiter.limit("5/minute")
@@ -36,18 +45,63 @@ class SolveResource(Resource):
                     },
                 }, 200
 
-            solver = OptimizedSudokuSolver(board)
-            solution = solver.solve()
+            solved_grid, coefficient = get_executor().run(solve_grid, grid)
 
             return {
                 "success": True,
                 "data": {
                     "original_grid": grid,
-                    "solved_grid": solution.grid,
-                    "difficulty_coefficient": round(solver.improved_coefficient, 2),
+                    "solved_grid": solved_grid,
+                    "difficulty_coefficient": round(coefficient, 2),
                 },
             }, 200
 
+        except ExecutorSaturated:
+            return SOLVER_BUSY
+        except TaskTimeout:
+            return SOLVER_TIMEOUT
         except Exception:
             logger.exception("Failed to solve puzzle")
             return {"error": "Failed to solve"}, 500
+
+
+class SolveBatchResource(Resource):
+    MAX_GRIDS = 20
+
+    @limiter.limit("5/minute")
+    @require_api_key
+    def post(self):
+        try:
+            data = request.get_json()
+
+            if not data or not isinstance(data.get("grids"), list):
+                return {"error": "grids field must be a list"}, 400
+
+            items = data["grids"]
+            if len(items) > self.MAX_GRIDS:
+                return {"error": f"At most {self.MAX_GRIDS} grids per request"}, 400
+
+            results = [None] * len(items)
+            indexes, grids = [], []
+            for index, item in enumerate(items):
+                grid, error = normalize_grid(item)
+                if error:
+                    results[index] = {"index": index, "error": error}
+                else:
+                    indexes.append(index)
+                    grids.append(grid)
+
+            # Todo el lote es una sola tarea del pool
+            solved = get_executor().run(solve_grids, grids) if grids else []
+            for index, result in zip(indexes, solved):
+                results[index] = {"index": index, **result}
+
+            return {"success": True, "data": {"results": results}}, 200
+
+        except ExecutorSaturated:
+            return SOLVER_BUSY
+        except TaskTimeout:
+            return SOLVER_TIMEOUT
+        except Exception:
+            logger.exception("Failed to solve batch")
+            return {"error": "Failed to solve"}, 500
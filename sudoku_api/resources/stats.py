@@ -1,19 +1,34 @@
 from flask_restx import Resource
+from sudoku_api.cache import TTLCache
+from sudoku_api.http_cache import cached_response
 from sudoku_api.resources import get_db
 
+# Segundos que CDN y clientes pueden reutilizar /api/stats
+STATS_MAX_AGE = 300
+
+# Segundos que cada worker reutiliza los conteos sin ir a la BD
+STATS_CACHE_TTL = 60
+
+_stats_cache = TTLCache(max_size=1, ttl=STATS_CACHE_TTL)
+
 
 class StatsResource(Resource):
     def get(self):
         try:
-            db = get_db()
-            boards_data = db.get_boards()
+            boards = _stats_cache.get("boards")
+            if boards is None:
+                boards = get_db().get_boards().get("boards", {})
+                _stats_cache.set("boards", boards)
 
-            return {
-                "success": True,
-                "data": {
-                    "total_puzzles": db.count_all_puzzles(),
-                    "boards": boards_data.get("boards", {}),
+            return cached_response(
+                {
+                    "success": True,
+                    "data": {
+                        "total_puzzles": sum(boards.values()),
+                        "boards": boards,
+                    },
                 },
-            }, 200
+                max_age=STATS_MAX_AGE,
+            )
         except Exception as e:
             return {"error": "Failed to get stats", "message": str(e)}, 500
@@ -2,10 +2,15 @@ import logging
 from flask import g
 from flask_restx import Resource
 from sudoku_api.auth import require_firebase_auth
-from sudoku_api.resources import get_db
+from sudoku_api.database import ProgressConflict
+from sudoku_api.resources import get_db, get_progress_buffer
+from sudoku_api.transforms import MAX_VARIANT_SEED
 
 logger = logging.getLogger(__name__)
 
+# Celdas distintas en un guardado por movimientos: más que eso es el tablero
+MAX_MOVES = 81
+
 
 class AuthRegisterResource(Resource):
     @require_firebase_auth
@@ -51,34 +56,92 @@ class ProgressSaveResource(Resource):
         time_elapsed = body.get("time_elapsed", 0)
         hints_used = body.get("hints_used", 0)
         completed = bool(body.get("completed", False))
+        variant_seed = body.get("variant_seed", 0)
+
+        moves = body.get("moves")
+        if moves is not None:
+            return self._save_moves(body, puzzle_id, moves, time_elapsed, hints_used, completed)
 
         if puzzle_id is None or current_state is None:
-            return {"error": "puzzle_id and current_state are required"}, 400
+            return {"error": "puzzle_id and current_state (or moves) are required"}, 400
+        if not _is_int(variant_seed) or not 0 <= variant_seed <= MAX_VARIANT_SEED:
+            return {"error": "variant_seed must be an integer between 0 and 2^31-1"}, 400
 
         try:
-            db = get_db()
-            progress = db.save_progress(
-                user_id=g.firebase_uid,
-                puzzle_id=puzzle_id,
-                current_state=current_state,
-                time_elapsed=time_elapsed,
-                hints_used=hints_used,
-                completed=completed,
-            )
-            if completed:
-                puzzle = db.find_puzzle_by_id(puzzle_id)
-                if puzzle:
-                    db.update_user_stats(
-                        user_id=g.firebase_uid,
-                        completed=True,
-                        difficulty=puzzle["difficulty"],
-                        time_seconds=time_elapsed,
-                    )
+            progress = {
+                "user_id": g.firebase_uid,
+                "puzzle_id": puzzle_id,
+                "current_state": current_state,
+                "time_elapsed": time_elapsed,
+                "hints_used": hints_used,
+                "completed": completed,
+                "variant_seed": variant_seed,
+            }
+            buffer = get_progress_buffer()
+            if buffer is not None:
+                # Write-behind: los no completados se escriben en el próximo lote
+                progress = buffer.save(**progress)
+            else:
+                # Con completed=True también actualiza user_stats en la misma sentencia
+                progress = get_db().save_progress(**progress)
             return {"success": True, "data": {"progress": _serialize_progress(progress)}}, 200
         except Exception:
             logger.exception("Failed to save progress")
             return {"error": "Failed to save progress"}, 500
 
+    def _save_moves(self, body, puzzle_id, moves, time_elapsed, hints_used, completed):
+        """Aplica `moves` ([fila, columna, valor]) sobre la versión `base_version`."""
+        base_version = body.get("base_version")
+        if puzzle_id is None or not _is_int(base_version):
+            return {"error": "puzzle_id and base_version are required with moves"}, 400
+        if not isinstance(moves, list) or not 0 < len(moves) <= MAX_MOVES or not all(
+            _is_move(move) for move in moves
+        ):
+            return {
+                "error": f"moves must be a list of 1 to {MAX_MOVES} [row, column, value] "
+                "with row and column in 0-8 and value in 0-9"
+            }, 400
+
+        update = {
+            "user_id": g.firebase_uid,
+            "puzzle_id": puzzle_id,
+            "base_version": base_version,
+            "moves": moves,
+            "time_elapsed": time_elapsed,
+            "hints_used": hints_used,
+            "completed": completed,
+        }
+        try:
+            buffer = get_progress_buffer()
+            if buffer is not None:
+                progress = buffer.apply_moves(**update)
+            else:
+                progress = get_db().apply_progress_moves(**update)
+            return {"success": True, "data": {"progress": _serialize_progress(progress)}}, 200
+        except ProgressConflict as e:
+            return {
+                "error": "Progress was modified; resend the full current_state",
+                "current_version": e.current_version,
+            }, 409
+        except Exception:
+            logger.exception("Failed to save progress moves")
+            return {"error": "Failed to save progress"}, 500
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_move(move) -> bool:
+    return (
+        isinstance(move, list)
+        and len(move) == 3
+        and all(_is_int(n) for n in move)
+        and 0 <= move[0] <= 8
+        and 0 <= move[1] <= 8
+        and 0 <= move[2] <= 9
+    )
+
 
 def _serialize_user(row: dict) -> dict:
     return {
@@ -105,8 +168,10 @@ def _serialize_stats(row: dict) -> dict:
 def _serialize_progress(row: dict) -> dict:
     return {
         "puzzle_id": row["puzzle_id"],
+        "variant_seed": row["variant_seed"],
         "time_elapsed": row["time_elapsed"],
         "hints_used": row["hints_used"],
         "completed": row["completed"],
         "completed_at": str(row["completed_at"]) if row["completed_at"] else None,
+        "version": row["version"],
     }
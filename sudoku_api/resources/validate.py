@@ -3,7 +3,7 @@ from flask_restx import Resource
 from flask import request
 from sudoku_api.extensions import limiter
 from sudoku_api.auth import require_api_key
-from sudoku_api.validator import Validator, validate_grid_format
+from sudoku_api.validator import Validator, normalize_grid, validate_batch, validate_grid_format
 
 logger = logging.getLogger(__name__)
 
@@ -44,3 +44,50 @@ class ValidateResource(Resource):
         except Exception:
             logger.exception("Validation failed")
             return {"error": "Validation failed"}, 500
+
+
+class ValidateBatchResource(Resource):
+    MAX_GRIDS = 100
+
+    @limiter.limit("10/minute")
+    @require_api_key
+    def post(self):
+        try:
+            data = request.get_json()
+
+            if not data or not isinstance(data.get("grids"), list):
+                return {"error": "grids field must be a list"}, 400
+
+            items = data["grids"]
+            if len(items) > self.MAX_GRIDS:
+                return {"error": f"At most {self.MAX_GRIDS} grids per request"}, 400
+
+            results = [None] * len(items)
+            indexes, grids = [], []
+            for index, item in enumerate(items):
+                grid, error = normalize_grid(item)
+                if error:
+                    results[index] = {"index": index, "error": error}
+                else:
+                    indexes.append(index)
+                    grids.append(grid)
+
+            # Una sola pasada vectorizada para todos los grids bien formados
+            valid = validate_batch(grids) if grids else []
+            for index, grid, is_valid in zip(indexes, grids, valid):
+                filled = sum(1 for row in grid for cell in row if cell != 0)
+                results[index] = {
+                    "index": index,
+                    "is_valid": bool(is_valid),
+                    "validation_details": {
+                        "total_cells": 81,
+                        "filled_cells": filled,
+                        "empty_cells": 81 - filled,
+                    },
+                }
+
+            return {"success": True, "data": {"results": results}}, 200
+
+        except Exception:
+            logger.exception("Batch validation failed")
+            return {"error": "Validation failed"}, 500
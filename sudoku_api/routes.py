@@ -1,8 +1,8 @@
 from sudoku_api.resources.daily import DailyPuzzleResource
 from sudoku_api.resources.stats import StatsResource
 from sudoku_api.resources.game import GameResource
-from sudoku_api.resources.validate import ValidateResource
-from sudoku_api.resources.solve import SolveResource
+from sudoku_api.resources.validate import ValidateResource, ValidateBatchResource
+from sudoku_api.resources.solve import SolveResource, SolveBatchResource
 from sudoku_api.resources.health import HealthResource
 from sudoku_api.resources.user import AuthRegisterResource, UserStatsResource, ProgressSaveResource
 
@@ -16,6 +16,8 @@ def register_routes(api, models):
 
     ValidateResource.post = ns.expect(models["grid"])(ValidateResource.post)
     SolveResource.post = ns.expect(models["grid"])(SolveResource.post)
+    ValidateBatchResource.post = ns.expect(models["grid_batch"])(ValidateBatchResource.post)
+    SolveBatchResource.post = ns.expect(models["grid_batch"])(SolveBatchResource.post)
 
     ns.add_resource(HealthResource, "/health")
     ns.add_resource(DailyPuzzleResource, "/daily")
@@ -23,6 +25,8 @@ def register_routes(api, models):
     ns.add_resource(GameResource, "/game")
     ns.add_resource(ValidateResource, "/validate")
     ns.add_resource(SolveResource, "/solve")
+    ns.add_resource(ValidateBatchResource, "/validate/batch")
+    ns.add_resource(SolveBatchResource, "/solve/batch")
     ns.add_resource(AuthRegisterResource, "/auth/register")
     ns.add_resource(UserStatsResource, "/user/stats")
     ns.add_resource(ProgressSaveResource, "/progress/save")
@@ -0,0 +1,72 @@
+"""Respuestas JSON pre-serializadas con orjson para /api/game y /api/daily.
+
+Un puzzle guardado nunca cambia, así que su respuesta completa (grillas,
+`empty_cells` y `hints_coordinates`) se codifica una vez y se reutiliza:
+servirlo es copiar bytes ya construidos.
+"""
+
+from datetime import date
+
+import orjson
+from flask import Response
+
+from sudoku_api.cache import TTLCache
+from sudoku_api.transforms import puzzle_variant
+
+# (puzzle_id, variant_seed, fecha del diario) -> bytes de la respuesta.
+# Alcanza para la reserva completa del pool (PUZZLE_POOL_SIZE x 7 niveles).
+_bodies = TTLCache(max_size=4096)
+
+
+def json_response(body: bytes, status: int = 200, headers: dict = None) -> Response:
+    return Response(body, status=status, headers=headers, mimetype="application/json")
+
+
+def encode_puzzle(puzzle: dict, variant_seed: int = 0, day: date = None) -> bytes:
+    """Codifica la respuesta de /game (o de /daily si se pasa `day`)"""
+    if variant_seed:
+        puzzle = puzzle_variant(puzzle, variant_seed)
+
+    playable = puzzle["playable_grid"]
+    hints = [
+        [row_num, column_num]
+        for row_num, row in enumerate(playable)
+        for column_num, number in enumerate(row)
+        if number == 0
+    ]
+
+    metadata = {
+        "puzzle_id": puzzle["id"],
+        "variant_seed": variant_seed,
+        "empty_cells": len(hints),
+        "cached": True,
+    }
+    if day is not None:
+        metadata["is_daily"] = True
+        metadata["date_assigned"] = str(day)
+    metadata["hints_coordinates"] = hints
+
+    return orjson.dumps(
+        {
+            "success": True,
+            "data": {
+                "playable": {"grid": playable, "is_valid": False},
+                "solution": {"grid": puzzle["solution_grid"], "is_valid": True},
+                "difficulty": {
+                    "level": puzzle["difficulty"],
+                    "coefficient": round(puzzle["coefficient"], 2),
+                },
+                "metadata": metadata,
+            },
+        }
+    )
+
+
+def cached_puzzle_body(puzzle: dict, variant_seed: int = 0, day: date = None) -> bytes:
+    """Como encode_puzzle, pero reutiliza los bytes ya codificados"""
+    key = (puzzle["id"], variant_seed, day)
+    body = _bodies.get(key)
+    if body is None:
+        body = encode_puzzle(puzzle, variant_seed, day)
+        _bodies.set(key, body)
+    return body
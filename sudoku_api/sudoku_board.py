@@ -1,64 +1,147 @@
 import random
-import copy
+
+from sudoku_api.transforms import SEED_GRID, SudokuTransform
+
+
+# Máscara con los bits 0..8 encendidos: el bit (n - 1) representa el número n
+ALL_NUMBERS_MASK = 0x1FF
+
+# Tablas precalculadas: máscara de candidatos -> números / cantidad de números
+NUMBERS_BY_MASK = tuple(
+    frozenset(n for n in range(1, 10) if mask >> (n - 1) & 1)
+    for mask in range(ALL_NUMBERS_MASK + 1)
+)
+COUNT_BY_MASK = tuple(len(numbers) for numbers in NUMBERS_BY_MASK)
+
+# Nodos máximos del backtracking de build() antes de usar la grilla semilla
+_BUILD_NODE_BUDGET = 2000
+
+
+def box_index(row_num, column_num):
+    return (row_num // 3) * 3 + column_num // 3
+
+
+# Conversión entre celdas (bytes 0-9) y el formato estándar de 81 caracteres
+_TO_CHARS = bytes.maketrans(bytes(range(10)), b"0123456789")
+_FROM_CHARS = bytes.maketrans(b"0123456789.", bytes(range(10)) + b"\x00")
+_VALID_CHARS = frozenset("0123456789.")
+
+
+def _grid_to_cells(grid):
+    cells = bytearray(81)
+    for row_num, row in enumerate(grid):
+        for column_num, number in enumerate(row):
+            cells[row_num * 9 + column_num] = number
+    return cells
 
 
 class SudokuBoard:
+    """Tablero de 81 celdas en un bytearray (fila por fila, 0 = vacía).
+
+    Junto a las celdas mantiene 27 máscaras de números ocupados: 9 filas,
+    9 columnas y 9 cajas, en ese orden.
+    """
+
+    __slots__ = ("_cells", "_masks")
+
     def __init__(self, grid=None):
-        self._grid = grid if grid else [[0] * 9 for _ in range(9)]
+        self._reset(_grid_to_cells(grid) if grid else bytearray(81))
+
+    @classmethod
+    def from_string(cls, value):
+        """Crea un tablero desde 81 caracteres ('0' o '.' = celda vacía)"""
+        if len(value) != 81 or not _VALID_CHARS.issuperset(value):
+            raise ValueError("El tablero debe tener 81 caracteres 0-9 o '.'")
+        board = cls.__new__(cls)
+        board._reset(bytearray(value.encode("ascii").translate(_FROM_CHARS)))
+        return board
+
+    def to_string(self):
+        """Representación estándar de 81 caracteres ('0' = celda vacía)"""
+        return self._cells.translate(_TO_CHARS).decode("ascii")
+
+    def _reset(self, cells):
+        self._cells = cells
+        self._rebuild_masks()
+
+    def _rebuild_masks(self):
+        """Recalcula las máscaras de números ocupados por fila, columna y caja"""
+        self._masks = [0] * 27
+        for index, number in enumerate(self._cells):
+            if number:
+                self._set_bit(*divmod(index, 9), 1 << (number - 1))
+
+    def _set_bit(self, row_num, column_num, bit):
+        masks = self._masks
+        masks[row_num] |= bit
+        masks[9 + column_num] |= bit
+        masks[18 + box_index(row_num, column_num)] |= bit
+
+    def _clear_bit(self, row_num, column_num, bit):
+        masks = self._masks
+        masks[row_num] &= ~bit
+        masks[9 + column_num] &= ~bit
+        masks[18 + box_index(row_num, column_num)] &= ~bit
 
     def build(self):
-        attempts, row_num = 0, 0
-        while row_num < 9:
-            while not self._build_new_row(row_num):
-                self._grid[row_num] = [0] * 9
-                attempts += 1
-
-                if attempts > 50:
-                    self._grid = [[0 for _ in range(9)] for _ in range(9)]
-                    attempts, row_num = 0, 0
-                    continue
-
-            row_num += 1
-
-    def _build_new_row(self, row_num):
-        for column_num in range(9):
-            available_numbers = self.get_available_numbers(row_num, column_num)
-            if not available_numbers:
-                return False
-            number = random.choice(list(available_numbers))
-            self._grid[row_num][column_num] = number
-        return True
+        """Llena el tablero con una solución completa aleatoria.
+
+        Backtracking aleatorio en orden de filas sobre las máscaras de bits.
+        Si se agota el presupuesto de nodos se recurre a una transformación
+        aleatoria de la grilla semilla, así que el peor caso está acotado.
+        """
+        self._reset(bytearray(81))
+        if not self._fill(0, [_BUILD_NODE_BUDGET]):
+            self._reset(_grid_to_cells(SudokuTransform.random().apply(SEED_GRID)))
+
+    def _fill(self, index, budget):
+        if index == 81:
+            return True
+
+        budget[0] -= 1
+        if budget[0] < 0:
+            return False
+
+        row_num, column_num = divmod(index, 9)
+        numbers = list(self.get_available_numbers(row_num, column_num))
+        random.shuffle(numbers)
+        for number in numbers:
+            self.assign(row_num, column_num, number)
+            if self._fill(index + 1, budget):
+                return True
+            self.clear_cell(row_num, column_num)
+        return False
+
+    def get_candidates_mask(self, row_num, column_num):
+        """Máscara de bits con los números que aún caben en la celda"""
+        masks = self._masks
+        return ALL_NUMBERS_MASK & ~(
+            masks[row_num]
+            | masks[9 + column_num]
+            | masks[18 + box_index(row_num, column_num)]
+        )
 
     def get_available_numbers(self, row_num, column_num):
-        row_occupied_numbers = {self._grid[row_num][j] for j in range(9)}
-        column_occupied_numbers = {self._grid[i][column_num] for i in range(9)}
-        sub__grid_low_row = row_num - row_num % 3
-        sub__grid_low_column = column_num - column_num % 3
-        sub__grid_occupied_numbers = {
-            self._grid[i][j]
-            for i in range(sub__grid_low_row, sub__grid_low_row + 3)
-            for j in range(sub__grid_low_column, sub__grid_low_column + 3)
-        }
-        occupied_numbers = (
-            row_occupied_numbers | column_occupied_numbers | sub__grid_occupied_numbers
-        )
-        return {1, 2, 3, 4, 5, 6, 7, 8, 9} - occupied_numbers
+        return NUMBERS_BY_MASK[self.get_candidates_mask(row_num, column_num)]
+
+    def count_available_numbers(self, row_num, column_num):
+        return COUNT_BY_MASK[self.get_candidates_mask(row_num, column_num)]
 
     def get_empty_cells(self):
-        return [
-            (row_num, column_num)
-            for row_num in range(9)
-            for column_num in range(9)
-            if not self._grid[row_num][column_num]
-        ]
+        return [divmod(index, 9) for index, number in enumerate(self._cells) if not number]
+
+    def get(self, row_num, column_num):
+        return self._cells[row_num * 9 + column_num]
 
     def assign(self, row_num, column_num, number):
-        assert number in self.get_available_numbers(row_num, column_num)
-        self._grid[row_num][column_num] = number
+        bit = 1 << (number - 1)
+        assert self.get_candidates_mask(row_num, column_num) & bit
+        self._cells[row_num * 9 + column_num] = number
+        self._set_bit(row_num, column_num, bit)
 
     # Returns if each row fulfills the criterion of having only one element from 1 to 9
     def _check_rows(self):
-        for row in self._grid:
+        for row in self.grid:
             if len(set(row) - {0}) != 9:
                 return False
         return True
@@ -66,17 +149,17 @@ class SudokuBoard:
     # Returns if each column fulfills the criterion of having only one element from 1 to 9
     def _check_columns(self):
         for icolumn in range(9):
-            column = [row[icolumn] for row in self._grid]
+            column = self._cells[icolumn::9]
             if len(set(column) - {0}) != 9:
                 return False
         return True
 
-    # Returns if each sub _grid fulfills the criterion of having only one element from 1 to 9
+    # Returns if each sub grid fulfills the criterion of having only one element from 1 to 9
     def _check_sub_grids(self):
         for irow in range(0, 9, 3):
             for icolumn in range(0, 9, 3):
                 sub_grid = [
-                    self._grid[i][j]
+                    self._cells[i * 9 + j]
                     for i in range(irow, irow + 3)
                     for j in range(icolumn, icolumn + 3)
                 ]
@@ -84,28 +167,60 @@ class SudokuBoard:
                     return False
         return True
 
+    def has_conflicts(self):
+        """True si algún número se repite en una fila, columna o caja"""
+        masks = [0] * 27
+        for index, number in enumerate(self._cells):
+            if not number:
+                continue
+            row_num, column_num = divmod(index, 9)
+            units = (row_num, 9 + column_num, 18 + box_index(row_num, column_num))
+            bit = 1 << (number - 1)
+            for unit in units:
+                if masks[unit] & bit:
+                    return True
+                masks[unit] |= bit
+        return False
+
     def clear_cell(self, row_num, column_num):
-        self._grid[row_num][column_num] = 0
+        index = row_num * 9 + column_num
+        number = self._cells[index]
+        if number:
+            self._cells[index] = 0
+            self._clear_bit(row_num, column_num, 1 << (number - 1))
 
     def is_cell_empty(self, row_num, column_num):
-        return self._grid[row_num][column_num] == 0
+        return self._cells[row_num * 9 + column_num] == 0
 
     def clone(self):
-        new_sudoku_grid = copy.deepcopy(self._grid)
-        return SudokuBoard(new_sudoku_grid)
+        new_board = SudokuBoard.__new__(SudokuBoard)
+        new_board._cells = self._cells[:]
+        new_board._masks = self._masks[:]
+        return new_board
 
     # Returns if the sudoku matrix is valid or not.
     @property
     def is_valid(self):
         return self._check_rows() and self._check_columns() and self._check_sub_grids()
 
+    @property
+    def cells(self):
+        """Vista directa de las 81 celdas; no modificar sin pasar por assign/clear_cell"""
+        return self._cells
+
     @property
     def grid(self):
-        type(self._grid)
-        return self._grid
+        """Copia 9x9 (lista de listas) de las celdas, para la capa de API"""
+        cells = self._cells
+        return [list(cells[i:i + 9]) for i in range(0, 81, 9)]
 
     def __eq__(self, other):
-        return self._grid == other.grid
+        if not isinstance(other, SudokuBoard):
+            return NotImplemented
+        return self._cells == other._cells
+
+    def __hash__(self):
+        return hash(bytes(self._cells))
 
     def __str__(self):
-        return "\n".join([str(row) for row in self._grid])
+        return "\n".join([str(row) for row in self.grid])
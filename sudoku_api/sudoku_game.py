@@ -2,6 +2,8 @@ import random
 from sudoku_api.sudoku_board import SudokuBoard
 from sudoku_api.sudoku_solver import OptimizedSudokuSolver
 from sudoku_api.enums import DifficultyLevel
+from sudoku_api.improved_difficulty import FastDifficultyCalculator
+from sudoku_api.canonical import canonical_hash
 
 
 class SudokuGame:
@@ -16,6 +18,14 @@ class SudokuGame:
         self.solution = solution
         self.difficult_level = difficult_level
         self.difficult_coefficient = difficult_coefficient
+        self._canonical_hash = None
+
+    @property
+    def canonical_hash(self) -> int:
+        """Hash de la forma canónica (ver sudoku_api.canonical), calculado una vez"""
+        if self._canonical_hash is None:
+            self._canonical_hash = canonical_hash(self.playable, self.solution)
+        return self._canonical_hash
 
 
 class OptimizedSudokuGameGenerator:
@@ -75,6 +85,7 @@ class OptimizedSudokuGameGenerator:
         solution.build()
 
         playable = solution.clone()
+        solver = OptimizedSudokuSolver(playable)
         successful_removals = 0
         max_empty_cells = min(iterations, 64)
         report_interval = max(5, iterations // 10)
@@ -87,16 +98,10 @@ class OptimizedSudokuGameGenerator:
             if playable.is_cell_empty(row, col):
                 continue
 
-            new_playable = playable.clone()
-            new_playable.clear_cell(row, col)
-
-            solver = OptimizedSudokuSolver(new_playable)
-            try:
-                solver.solve()
-                playable = new_playable
-                successful_removals += 1
-            except Exception:
+            # Solo unicidad: el solver reutiliza el mismo tablero entre remociones
+            if not solver.remove_if_unique(row, col):
                 continue
+            successful_removals += 1
 
             if progress_callback and (i % report_interval == 0 or i == iterations - 1):
                 progress = int(10 + (i / iterations) * 80)
@@ -108,12 +113,9 @@ class OptimizedSudokuGameGenerator:
         if progress_callback:
             progress_callback(95, "Calculando dificultad final...")
 
-        final_solver = OptimizedSudokuSolver(playable)
-        try:
-            final_solver.solve()
-            difficult_coefficient = final_solver.improved_coefficient
-        except Exception:
-            difficult_coefficient = 5.0
+        # El tablero tiene solución única por construcción: no hace falta resolverlo
+        difficulty_calc = FastDifficultyCalculator(playable)
+        difficult_coefficient = difficulty_calc.calculate_improved_coefficient()
 
         difficult_level = DifficultyLevel.from_coefficient(difficult_coefficient)
 
@@ -1,5 +1,19 @@
 from functools import lru_cache
+from sudoku_api.dlx_solver import DLXSolver
+from sudoku_api.enums import SolverBackend
 from sudoku_api.improved_difficulty import FastDifficultyCalculator
+from sudoku_api.sudoku_board import ALL_NUMBERS_MASK, COUNT_BY_MASK, NUMBERS_BY_MASK
+
+# Las 27 unidades del tablero: filas, columnas y cajas
+UNITS = (
+    [[(row_num, column_num) for column_num in range(9)] for row_num in range(9)]
+    + [[(row_num, column_num) for row_num in range(9)] for column_num in range(9)]
+    + [
+        [(box_row + i, box_column + j) for i in range(3) for j in range(3)]
+        for box_row in range(0, 9, 3)
+        for box_column in range(0, 9, 3)
+    ]
+)
 
 
 class OptimizedSudokuSolver:
@@ -8,11 +22,11 @@ class OptimizedSudokuSolver:
         self.improved_coefficient = 0
         self._solution_count = 0
         self._max_solutions = 2  # Solo necesitamos saber si hay más de una
+        self._trail = []
 
-    def solve(self):
+    def solve(self, backend: SolverBackend = None):
         """Resuelve el sudoku y retorna la solución"""
-        solutions = []
-        self.solve_traversal(self.sudoku_board, solutions)
+        solutions = self._find_solutions(backend)
 
         if len(solutions) > 1:
             raise Exception("Sudoku has more than one solution")
@@ -24,72 +38,177 @@ class OptimizedSudokuSolver:
         
         return solutions[0]
 
+    def _find_solutions(self, backend):
+        """Busca hasta `_max_solutions` soluciones con el backend indicado"""
+        if backend is None:
+            backend = SolverBackend.get_default()
+
+        if backend == SolverBackend.DLX:
+            return DLXSolver(self.sudoku_board).find_solutions(self._max_solutions)
+
+        solutions = []
+        if not self.sudoku_board.has_conflicts():
+            self.solve_traversal(self.sudoku_board, solutions)
+        return solutions
+
+    def remove_if_unique(self, row_num, column_num):
+        """Vacía la celda si el tablero conserva su solución única.
+
+        Trabaja en sitio sobre `self.sudoku_board` y asume que el tablero
+        actual tiene solución única. Cualquier otra solución tras vaciar la
+        celda debe tener en ella un número distinto al actual, así que basta
+        con buscar una solución para cada alternativa. Retorna True si la
+        celda quedó vacía; si no, restaura el número original.
+        """
+        board = self.sudoku_board
+        number = board.get(row_num, column_num)
+        board.clear_cell(row_num, column_num)
+
+        mask = board.get_candidates_mask(row_num, column_num)
+        for alternative in NUMBERS_BY_MASK[mask & ~(1 << (number - 1))]:
+            board.assign(row_num, column_num, alternative)
+            found = self._has_solution(board)
+            board.clear_cell(row_num, column_num)
+            if found:
+                board.assign(row_num, column_num, number)
+                return False
+
+        return True
+
+    def _has_solution(self, sudoku_board):
+        solutions = []
+        max_solutions, self._max_solutions = self._max_solutions, 1
+        try:
+            self.solve_traversal(sudoku_board, solutions)
+        finally:
+            self._max_solutions = max_solutions
+        return bool(solutions)
+
     def solve_traversal(self, sudoku_board, solutions):
-        """Traversal optimizado con poda temprana"""
+        """Búsqueda en sitio con propagación, heurística MRV y poda temprana.
+
+        Antes de cada ramificación aplica naked/hidden singles. Asigna, recurre
+        y deshace sobre el mismo tablero usando un trail (pila de deshacer);
+        solo se copian los tableros solución. Al terminar el tablero queda
+        exactamente como se recibió.
+        """
+        empty_cells = sudoku_board.get_empty_cells()
+        self._search(sudoku_board, empty_cells, solutions)
+
+    def _search(self, sudoku_board, empty_cells, solutions):
         # Si ya encontramos suficientes soluciones, parar
         if len(solutions) >= self._max_solutions:
             return
 
-        cells_to_solve = sudoku_board.get_empty_cells()
+        mark = len(self._trail)
+        if self._propagate(sudoku_board, empty_cells):
+            self._branch(sudoku_board, empty_cells, solutions)
+        self._undo(sudoku_board, mark)
+
+    def _branch(self, sudoku_board, empty_cells, solutions):
+        remaining = [
+            (row_num, column_num)
+            for row_num, column_num in empty_cells
+            if sudoku_board.is_cell_empty(row_num, column_num)
+        ]
 
         # Si no hay celdas vacías, encontramos una solución
-        if not cells_to_solve:
-            if sudoku_board not in solutions:
-                solutions.append(sudoku_board)
-                self._solution_count += 1
+        if not remaining:
+            solutions.append(sudoku_board.clone())
+            self._solution_count += 1
             return
 
-        # Ordenar celdas por número de opciones disponibles (MRV heuristic)
-        cells_with_options = []
-        for row_num, column_num in cells_to_solve:
-            available = sudoku_board.get_available_numbers(row_num, column_num)
-
-            # Poda temprana: si una celda no tiene opciones, este camino no tiene solución
-            if not available:
-                return
-
-            cells_with_options.append((len(available), row_num, column_num, available))
-
-        # Ordenar por número de opciones (menos opciones primero)
-        cells_with_options.sort(key=lambda x: x[0])
-
-        # Tomar la celda con menos opciones
-        _, row_num, column_num, available_numbers = cells_with_options[0]
-
-        # Probar cada número disponible
-        for number in available_numbers:
+        # Tras la propagación toda celda tiene 2+ opciones: elegir la de menos (MRV)
+        best_cell, best_mask, best_count = None, 0, 10
+        for row_num, column_num in remaining:
+            mask = sudoku_board.get_candidates_mask(row_num, column_num)
+            count = COUNT_BY_MASK[mask]
+            if count < best_count:
+                best_cell, best_mask, best_count = (row_num, column_num), mask, count
+                if count == 2:
+                    break
+
+        row_num, column_num = best_cell
+        mark = len(self._trail)
+        for number in NUMBERS_BY_MASK[best_mask]:
             # Poda: si ya tenemos suficientes soluciones, parar
             if len(solutions) >= self._max_solutions:
-                return
+                break
 
-            sudoku_copy = sudoku_board.clone()
-            sudoku_copy.assign(row_num, column_num, number)
+            self._assign(sudoku_board, row_num, column_num, number)
+            self._search(sudoku_board, remaining, solutions)
+            self._undo(sudoku_board, mark)
 
-            # Verificación rápida de consistencia antes de continuar
-            if self._is_consistent(sudoku_copy):
-                self.solve_traversal(sudoku_copy, solutions)
+    def _propagate(self, sudoku_board, empty_cells):
+        """Aplica naked singles y hidden singles hasta llegar a un punto fijo.
 
-    def _is_consistent(self, board):
+        Retorna False si detecta una contradicción: una celda vacía sin
+        opciones o un número sin lugar posible en alguna fila, columna o caja.
+        Las asignaciones quedan en el trail para deshacerlas desde `_search`.
         """
-        Verificación rápida de consistencia
-        Retorna False si detecta una contradicción obvia
-        """
-        # Verificar si alguna celda vacía no tiene opciones disponibles
-        empty_cells = board.get_empty_cells()
-
-        # Solo verificar las primeras celdas para rapidez
-        for row, col in empty_cells[: min(3, len(empty_cells))]:
-            if len(board.get_available_numbers(row, col)) == 0:
-                return False
+        cells = sudoku_board.cells
+        changed = True
+        while changed:
+            changed = False
+
+            # Naked singles: celdas con una sola opción
+            for row_num, column_num in empty_cells:
+                if cells[row_num * 9 + column_num]:
+                    continue
+                mask = sudoku_board.get_candidates_mask(row_num, column_num)
+                if not mask:
+                    return False
+                if COUNT_BY_MASK[mask] == 1:
+                    self._assign(sudoku_board, row_num, column_num, mask.bit_length())
+                    changed = True
+
+            if changed:
+                continue
+
+            # Hidden singles: números con un solo lugar posible en la unidad
+            for unit in UNITS:
+                placed, once, twice = 0, 0, 0
+                for row_num, column_num in unit:
+                    number = cells[row_num * 9 + column_num]
+                    if number:
+                        placed |= 1 << (number - 1)
+                    else:
+                        mask = sudoku_board.get_candidates_mask(row_num, column_num)
+                        twice |= once & mask
+                        once |= mask
+
+                if (placed | once) != ALL_NUMBERS_MASK:
+                    return False
+
+                hidden = once & ~twice
+                while hidden:
+                    bit = hidden & -hidden
+                    hidden ^= bit
+                    for row_num, column_num in unit:
+                        if not cells[row_num * 9 + column_num] and (
+                            sudoku_board.get_candidates_mask(row_num, column_num) & bit
+                        ):
+                            self._assign(sudoku_board, row_num, column_num, bit.bit_length())
+                            changed = True
+                            break
 
         return True
 
-    def has_unique_solution(self):
+    def _assign(self, sudoku_board, row_num, column_num, number):
+        sudoku_board.assign(row_num, column_num, number)
+        self._trail.append((row_num, column_num))
+
+    def _undo(self, sudoku_board, mark):
+        """Deshace las asignaciones del trail hasta dejarlo con longitud `mark`"""
+        trail = self._trail
+        while len(trail) > mark:
+            row_num, column_num = trail.pop()
+            sudoku_board.clear_cell(row_num, column_num)
+
+    def has_unique_solution(self, backend: SolverBackend = None):
         """
         Método rápido para verificar si tiene solución única
         sin calcular el coeficiente de dificultad completo
         """
-        solutions = []
         self._max_solutions = 2  # Solo necesitamos encontrar máximo 2
-        self.solve_traversal(self.sudoku_board, solutions)
-        return len(solutions) == 1
+        return len(self._find_solutions(backend)) == 1
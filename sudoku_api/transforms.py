@@ -0,0 +1,122 @@
+"""Transformaciones que preservan la validez de un sudoku"""
+
+import hashlib
+import random
+
+# Semillas de variantes: 1..MAX_VARIANT_SEED (entero de 31 bits, cabe en INTEGER).
+# La semilla 0 es la identidad: el puzzle tal como está guardado.
+MAX_VARIANT_SEED = 2**31 - 1
+
+# Grilla completa válida usada como semilla: fila r desplazada 3 * (r % 3) + r // 3
+SEED_GRID = tuple(
+    tuple((3 * (row_num % 3) + row_num // 3 + column_num) % 9 + 1 for column_num in range(9))
+    for row_num in range(9)
+)
+
+
+def _random_order(rng):
+    """Orden de 9 líneas: bandas permutadas y líneas permutadas dentro de cada banda"""
+    bands = [0, 1, 2]
+    rng.shuffle(bands)
+    order = []
+    for band in bands:
+        lines = [band * 3, band * 3 + 1, band * 3 + 2]
+        rng.shuffle(lines)
+        order.extend(lines)
+    return tuple(order)
+
+
+class _SeedStream:
+    """Generador determinista para from_seed: blake2b en modo contador.
+
+    Las semillas quedan guardadas en `game_progress` junto a un estado en
+    coordenadas de la variante, así que la transformación de una semilla no
+    puede cambiar. random.Random no garantiza la misma secuencia entre
+    versiones de Python; esto sí. Expone `random` y `shuffle` como
+    random.Random para usarse en SudokuTransform.random.
+    """
+
+    def __init__(self, seed: int):
+        self._seed = seed.to_bytes(8, "big")
+        self._counter = 0
+
+    def _next(self) -> int:
+        digest = hashlib.blake2b(
+            self._seed + self._counter.to_bytes(8, "big"),
+            digest_size=8,
+            person=b"sudoku-variant",
+        ).digest()
+        self._counter += 1
+        return int.from_bytes(digest, "big")
+
+    def random(self) -> float:
+        return (self._next() >> 11) / 2**53
+
+    def shuffle(self, items):
+        """Fisher-Yates en sitio"""
+        for i in range(len(items) - 1, 0, -1):
+            j = self._next() % (i + 1)
+            items[i], items[j] = items[j], items[i]
+
+
+class SudokuTransform:
+    """Composición de simetrías del sudoku.
+
+    Aplica, en este orden: transposición opcional, reordenamiento de filas
+    (bandas y filas dentro de banda), reordenamiento de columnas (stacks y
+    columnas dentro de stack) y relabel de números. Cualquier combinación
+    lleva una grilla válida a otra válida y un puzzle de solución única a
+    otro de solución única.
+    """
+
+    def __init__(self, transpose=False, row_order=None, column_order=None, digit_map=None):
+        self.transpose = transpose
+        self.row_order = tuple(row_order) if row_order else tuple(range(9))
+        self.column_order = tuple(column_order) if column_order else tuple(range(9))
+        # digit_map[n] es el número que reemplaza a n; el 0 (vacío) se conserva
+        self.digit_map = tuple(digit_map) if digit_map else tuple(range(10))
+
+    @classmethod
+    def random(cls, rng=random):
+        digits = list(range(1, 10))
+        rng.shuffle(digits)
+        return cls(
+            transpose=rng.random() < 0.5,
+            row_order=_random_order(rng),
+            column_order=_random_order(rng),
+            digit_map=[0] + digits,
+        )
+
+    @classmethod
+    def from_seed(cls, seed: int):
+        """Transformación reproducible a partir de una semilla (0 = identidad).
+
+        Estable entre versiones de Python (ver _SeedStream).
+        """
+        if not seed:
+            return cls()
+        return cls.random(_SeedStream(seed))
+
+    def apply(self, grid):
+        """Retorna una nueva grilla 9x9 (lista de listas) transformada"""
+        if self.transpose:
+            grid = [[grid[i][j] for i in range(9)] for j in range(9)]
+        digit_map, column_order = self.digit_map, self.column_order
+        return [
+            [digit_map[grid[source_row][source_column]] for source_column in column_order]
+            for source_row in self.row_order
+        ]
+
+
+def puzzle_variant(puzzle: dict, seed: int) -> dict:
+    """Copia de una fila de `puzzles` con ambas grillas transformadas por `seed`.
+
+    La variante conserva dificultad y unicidad de la solución, así que no hace
+    falta resolverla; con la misma semilla siempre se obtiene la misma.
+    """
+    transform = SudokuTransform.from_seed(seed)
+    return {
+        **puzzle,
+        "playable_grid": transform.apply(puzzle["playable_grid"]),
+        "solution_grid": transform.apply(puzzle["solution_grid"]),
+    }
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class Validator:
     SUDOKU_NUMBER = 9
 
@@ -50,3 +53,65 @@ def validate_grid_format(grid):
             if not isinstance(cell, int) or not 0 <= cell <= 9:
                 return f"Invalid cell at [{i}][{j}]"
     return None
+
+
+def normalize_grid(value):
+    """Acepta una matriz 9x9 o un string de 81 caracteres ('0' o '.' = vacía).
+    Retorna (grid, None) con el grid 9x9 si es válido, o (None, mensaje de error)."""
+    if isinstance(value, str):
+        if len(value) != 81 or not set(value) <= set("0123456789."):
+            return None, "Grid string must have 81 characters 0-9 or '.'"
+        cells = [0 if ch == "." else int(ch) for ch in value]
+        return [cells[i:i + 9] for i in range(0, 81, 9)], None
+
+    error = validate_grid_format(value)
+    if error:
+        return None, error
+    return value, None
+
+
+# Índice de unidad (0-26) de cada celda: filas, columnas y cajas
+_ROW_UNIT = np.repeat(np.arange(9), 9).reshape(9, 9)
+_COLUMN_UNIT = _ROW_UNIT.T + 9
+_BOX_UNIT = (_ROW_UNIT // 3) * 3 + _ROW_UNIT.T // 3 + 18
+_CELL_UNITS = np.stack([_ROW_UNIT, _COLUMN_UNIT, _BOX_UNIT]).reshape(3, 81)
+
+
+def validate_batch(grids, return_masks=False):
+    """Valida N tableros completos a la vez con operaciones vectorizadas.
+
+    Args:
+        grids: array (N, 9, 9) de enteros 0-9 (o algo convertible con np.asarray)
+        return_masks: si es True también retorna las unidades con violaciones
+
+    Returns:
+        np.ndarray: vector bool (N,), True si el tablero tiene cada número del
+        1 al 9 exactamente una vez en cada fila, columna y caja. Con
+        return_masks retorna además un dict con máscaras bool (N, 9) en
+        "rows", "columns" y "boxes" que marcan las unidades inválidas.
+    """
+    grids = np.asarray(grids, dtype=np.uint8)
+    if grids.ndim != 3 or grids.shape[1:] != (9, 9):
+        raise ValueError("Se esperaba un array de forma (N, 9, 9)")
+    if grids.size and grids.max() > 9:
+        raise ValueError("Las celdas deben estar entre 0 y 9")
+
+    count = len(grids)
+    cells = grids.reshape(count, 1, 81).astype(np.intp)
+
+    # Cada celda aporta a 3 unidades: bincount sobre (tablero, unidad, número)
+    units = np.arange(count, dtype=np.intp).reshape(count, 1, 1) * 27 + _CELL_UNITS
+    keys = (units * 10 + cells).ravel()
+    counts = np.bincount(keys, minlength=count * 270).reshape(count, 27, 10)
+
+    unit_ok = (counts[:, :, 1:] == 1).all(axis=2)
+    valid = unit_ok.all(axis=1)
+    if not return_masks:
+        return valid
+
+    violations = ~unit_ok
+    return valid, {
+        "rows": violations[:, :9],
+        "columns": violations[:, 9:18],
+        "boxes": violations[:, 18:],
+    }
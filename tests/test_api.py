@@ -95,6 +95,33 @@ class TestSudokuAPI(unittest.TestCase):
         self.assertTrue(data["success"])
         self.assertIn("solved_grid", data["data"])
 
+    def test_validate_batch(self):
+        solved = "624539187519728634837614295143865729958247361762391458371956842496182573285473916"
+        response = self.client.post(
+            "/api/validate/batch",
+            data=json.dumps({"grids": [solved, "6" + solved[1:].replace("2", "6", 1), "123"]}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.data)["data"]["results"]
+        self.assertTrue(results[0]["is_valid"])
+        self.assertFalse(results[1]["is_valid"])
+        self.assertIn("error", results[2])
+
+    def test_solve_batch(self):
+        puzzle = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+        response = self.client.post(
+            "/api/solve/batch",
+            data=json.dumps({"grids": [puzzle, "0" * 81]}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.data)["data"]["results"]
+        self.assertEqual(results[0]["solved_grid"][0][0], 8)
+        self.assertIn("error", results[1])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+import random
+from unittest import TestCase, main
+from sudoku_api.sudoku_board import SudokuBoard
+from sudoku_api.transforms import (
+    MAX_VARIANT_SEED,
+    SEED_GRID,
+    SudokuTransform,
+    puzzle_variant,
+)
+
+
+class TestSudokuBoard(TestCase):
+    def test_build_produces_valid_grid(self):
+        for _ in range(20):
+            board = SudokuBoard()
+            board.build()
+            self.assertTrue(board.is_valid)
+            self.assertEqual(board.get_empty_cells(), [])
+
+    def test_string_round_trip(self):
+        puzzle = (
+            "800000000003600000070090200050007000000045700000100030001000068008500010"
+            "090000400"
+        )
+        board = SudokuBoard.from_string(puzzle.replace("0", "."))
+        self.assertEqual(board.to_string(), puzzle)
+        self.assertEqual(board.grid[0], [8, 0, 0, 0, 0, 0, 0, 0, 0])
+        self.assertEqual(SudokuBoard(board.grid), board)
+        self.assertRaises(ValueError, SudokuBoard.from_string, "1" * 80)
+        self.assertRaises(ValueError, SudokuBoard.from_string, "x" * 81)
+
+    def test_clone_is_independent_and_hashable(self):
+        board = SudokuBoard()
+        board.build()
+        copy = board.clone()
+        self.assertEqual(hash(copy), hash(board))
+        copy.clear_cell(0, 0)
+        self.assertNotEqual(copy, board)
+        self.assertFalse(board.is_cell_empty(0, 0))
+        self.assertEqual(copy.get_available_numbers(0, 0), {board.get(0, 0)})
+
+    def test_random_transform_preserves_validity(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            grid = SudokuTransform.random(rng).apply(SEED_GRID)
+            self.assertTrue(SudokuBoard(grid).is_valid)
+
+    def test_puzzle_variant_is_reproducible(self):
+        solution = [list(row) for row in SEED_GRID]
+        playable = [row[:] for row in solution]
+        playable[0][0] = 0
+        puzzle = {"id": 1, "playable_grid": playable, "solution_grid": solution}
+
+        self.assertEqual(puzzle_variant(puzzle, 0), puzzle)
+        variant = puzzle_variant(puzzle, 12345)
+        self.assertEqual(variant, puzzle_variant(puzzle, 12345))
+        self.assertTrue(SudokuBoard(variant["solution_grid"]).is_valid)
+        self.assertEqual(
+            [cell for row in variant["playable_grid"] for cell in row].count(0), 1
+        )
+
+    def test_from_seed_is_pinned(self):
+        # Las semillas se guardan con el progreso: su transformación no puede
+        # cambiar entre versiones de Python
+        expected = {
+            1: (
+                True,
+                (3, 4, 5, 0, 2, 1, 7, 6, 8),
+                (1, 0, 2, 3, 5, 4, 7, 8, 6),
+                (0, 2, 9, 4, 3, 1, 5, 6, 8, 7),
+            ),
+            12345: (
+                False,
+                (6, 8, 7, 3, 4, 5, 1, 0, 2),
+                (5, 4, 3, 0, 1, 2, 7, 8, 6),
+                (0, 6, 3, 9, 8, 7, 4, 1, 2, 5),
+            ),
+            MAX_VARIANT_SEED: (
+                True,
+                (0, 1, 2, 8, 7, 6, 5, 4, 3),
+                (2, 0, 1, 4, 3, 5, 7, 8, 6),
+                (0, 1, 5, 8, 4, 6, 3, 7, 2, 9),
+            ),
+        }
+        for seed, pinned in expected.items():
+            transform = SudokuTransform.from_seed(seed)
+            self.assertEqual(
+                (
+                    transform.transpose,
+                    transform.row_order,
+                    transform.column_order,
+                    transform.digit_map,
+                ),
+                pinned,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import time
+from unittest import TestCase, main
+from sudoku_api.cache import TTLCache
+
+
+class TestTTLCache(TestCase):
+    def test_expiration(self):
+        cache = TTLCache(ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2, expires_at=time.time() - 1)
+        cache.set("c", 3, ttl=0)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNone(cache.get("c"))
+
+    def test_lru_eviction(self):
+        cache = TTLCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.pop("c"), 3)
+        self.assertEqual(len(cache), 1)
+
+
+if __name__ == "__main__":
+    main()
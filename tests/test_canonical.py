@@ -0,0 +1,42 @@
+import random
+from unittest import TestCase, main
+from sudoku_api.canonical import canonical_form, canonical_hash
+from sudoku_api.sudoku_board import SudokuBoard
+from sudoku_api.sudoku_solver import OptimizedSudokuSolver
+from sudoku_api.transforms import SEED_GRID, SudokuTransform
+
+PUZZLE = (
+    "800000000003600000070090200050007000000045700000100030001000068008500010"
+    "090000400"
+)
+
+
+class TestCanonicalForm(TestCase):
+    def test_invariant_under_transforms(self):
+        rng = random.Random(7)
+        playable = SudokuBoard.from_string(PUZZLE)
+        expected = canonical_form(playable)
+        for _ in range(10):
+            transform = SudokuTransform.random(rng)
+            variant = SudokuBoard(transform.apply(playable.grid))
+            self.assertEqual(canonical_form(variant), expected)
+
+    def test_distinguishes_puzzles(self):
+        playable = SudokuBoard.from_string(PUZZLE)
+        solution = OptimizedSudokuSolver(playable).solve()
+        # Misma solución, una pista más
+        other = playable.clone()
+        other.assign(0, 1, solution.get(0, 1))
+        self.assertNotEqual(
+            canonical_hash(playable, solution), canonical_hash(other, solution)
+        )
+
+    def test_full_grid_is_minlex(self):
+        board = SudokuBoard([list(row) for row in SEED_GRID])
+        form = canonical_form(board)
+        self.assertTrue(form.startswith("123456789456789123789123456"))
+        self.assertTrue(SudokuBoard.from_string(form).is_valid)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+from unittest import TestCase, main, skipUnless
+from sudoku_api.database import PuzzleDB
+from sudoku_api.sudoku_board import SudokuBoard
+
+
+class TestGridEncoding(TestCase):
+    def test_round_trip(self):
+        board = SudokuBoard()
+        board.build()
+        board.clear_cell(4, 4)
+        self.assertEqual(PuzzleDB.decode_grid(board.to_string()), board.grid)
+
+    def test_decode_accepts_lists(self):
+        grid = [[0] * 9 for _ in range(9)]
+        self.assertIs(PuzzleDB.decode_grid(grid), grid)
+
+
+@skipUnless(os.environ.get("DATABASE_URL"), "requiere DATABASE_URL")
+class TestProgressWrites(TestCase):
+    USER = "test-progress-writes"
+
+    def setUp(self):
+        self.db = PuzzleDB()
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO users (id) VALUES (%s) ON CONFLICT DO NOTHING", (self.USER,)
+                )
+                cur.execute("SELECT id FROM puzzles ORDER BY id LIMIT 1")
+                self.puzzle_id = cur.fetchone()["id"]
+
+    def tearDown(self):
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM users WHERE id = %s", (self.USER,))
+
+    def progress(self, value, completed=False):
+        return {
+            "user_id": self.USER,
+            "puzzle_id": self.puzzle_id,
+            "current_state": [[value] * 9 for _ in range(9)],
+            "time_elapsed": 10 * value,
+            "hints_used": 0,
+            "completed": completed,
+            "variant_seed": 0,
+        }
+
+    def test_stale_batch_does_not_reopen_completed_game(self):
+        self.db.save_progress(**self.progress(1))
+        final = self.db.save_progress(**self.progress(2, completed=True))
+
+        # Autoguardado viejo que otro worker escribe tarde
+        self.db.save_progress_batch([self.progress(1)])
+
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT * FROM game_progress WHERE user_id = %s", (self.USER,)
+                )
+                row = cur.fetchone()
+        self.assertTrue(row["completed"])
+        self.assertEqual(row["current_state"][0][0], 2)
+        self.assertEqual(row["version"], final["version"])
+
+
+if __name__ == "__main__":
+    main()
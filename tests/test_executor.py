@@ -0,0 +1,38 @@
+import time
+from unittest import TestCase, main
+from sudoku_api.executor import ExecutorSaturated, SolverExecutor, TaskTimeout, solve_grid
+
+
+class TestSolverExecutor(TestCase):
+    PUZZLE = [
+        [6, 2, 4, 5, 3, 9, 1, 8, 7],
+        [5, 1, 9, 7, 2, 8, 6, 3, 4],
+        [8, 3, 7, 6, 1, 4, 2, 9, 5],
+        [1, 4, 3, 8, 6, 5, 7, 2, 9],
+        [9, 5, 8, 2, 4, 7, 3, 6, 1],
+        [7, 6, 2, 3, 9, 1, 4, 5, 8],
+        [3, 7, 1, 9, 5, 6, 8, 4, 2],
+        [4, 9, 6, 1, 8, 2, 5, 7, 3],
+        [2, 8, 5, 4, 7, 3, 9, 1, 0],
+    ]
+
+    def test_inline_when_no_workers(self):
+        executor = SolverExecutor(workers=0, max_pending=1, timeout=1)
+        solved_grid, _ = executor.run(solve_grid, self.PUZZLE)
+        self.assertEqual(solved_grid[8][8], 6)
+
+    def test_pool_timeout_and_backpressure(self):
+        executor = SolverExecutor(workers=1, max_pending=1, timeout=0.2)
+        try:
+            solved_grid, _ = executor.run(solve_grid, self.PUZZLE)
+            self.assertEqual(solved_grid[8][8], 6)
+
+            # La tarea vencida conserva su cupo hasta terminar
+            self.assertRaises(TaskTimeout, executor.run, time.sleep, 1)
+            self.assertRaises(ExecutorSaturated, executor.run, solve_grid, self.PUZZLE)
+        finally:
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
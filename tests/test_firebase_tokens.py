@@ -0,0 +1,98 @@
+import datetime
+import time
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+
+from sudoku_api.firebase_tokens import FirebaseTokenVerifier, InvalidTokenError
+
+PROJECT_ID = "sudoku-test"
+
+
+def _make_certificate():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(1)
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return private_pem, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class FakeKeys:
+    def __init__(self, certs):
+        self.certs = certs
+        self.refreshes = 0
+
+    def get(self):
+        return self.certs
+
+    def refresh_if_stale(self):
+        self.refreshes += 1
+
+
+class TestFirebaseTokenVerifier(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        private_pem, cls.certificate = _make_certificate()
+        cls.signer = crypt.RSASigner.from_string(private_pem, key_id="k1")
+
+    def _token(self, **overrides):
+        now = int(time.time())
+        claims = {
+            "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+            "aud": PROJECT_ID,
+            "sub": "user-1",
+            "iat": now,
+            "exp": now + 3600,
+            "email": "a@b.c",
+        }
+        claims.update(overrides)
+        return jwt.encode(self.signer, claims).decode()
+
+    def setUp(self):
+        self.keys = FakeKeys({"k1": self.certificate})
+        self.verifier = FirebaseTokenVerifier(PROJECT_ID, keys=self.keys)
+
+    def test_verifies_and_caches(self):
+        token = self._token()
+        self.assertEqual(self.verifier.verify(token)["uid"], "user-1")
+        with patch.object(jwt, "decode", side_effect=AssertionError("no cache")):
+            self.assertEqual(self.verifier.verify(token)["uid"], "user-1")
+
+    def test_rejects_wrong_project(self):
+        with self.assertRaises(InvalidTokenError):
+            self.verifier.verify(self._token(aud="other"))
+        with self.assertRaises(InvalidTokenError):
+            self.verifier.verify(self._token(iss="https://securetoken.google.com/other"))
+
+    def test_rejects_expired_token(self):
+        with self.assertRaises(InvalidTokenError):
+            self.verifier.verify(self._token(iat=1000, exp=2000))
+
+    def test_unknown_kid_refreshes_keys(self):
+        self.keys.certs = {"k2": self.certificate}
+        with self.assertRaises(InvalidTokenError):
+            self.verifier.verify(self._token())
+        self.assertEqual(self.keys.refreshes, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import time
+from unittest import TestCase, main
+
+from app import app
+from sudoku_api.http_cache import cached_response, compute_etag
+
+
+class TestCachedResponse(TestCase):
+    payload = {"success": True, "data": {"total_puzzles": 42}}
+
+    def test_headers(self):
+        with app.test_request_context("/api/stats"):
+            body, status, headers = cached_response(self.payload, max_age=300)
+        self.assertEqual(status, 200)
+        self.assertEqual(body, self.payload)
+        self.assertEqual(headers["ETag"], f'"{compute_etag(self.payload)}"')
+        self.assertEqual(headers["Cache-Control"], "public, max-age=300")
+
+    def test_expires_at(self):
+        with app.test_request_context("/api/daily"):
+            _, _, headers = cached_response(self.payload, expires_at=time.time() + 60.5)
+        self.assertIn(headers["Cache-Control"], ("public, max-age=60", "public, max-age=59"))
+
+    def test_not_modified(self):
+        etag = f'"{compute_etag(self.payload)}"'
+        with app.test_request_context(headers={"If-None-Match": etag}):
+            response = cached_response(self.payload, max_age=300)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+
+        with app.test_request_context(headers={"If-None-Match": '"otro"'}):
+            _, status, _ = cached_response(self.payload, max_age=300)
+        self.assertEqual(status, 200)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import os
+import sys
+import threading
+from unittest import TestCase, main
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sudoku_api.database import ProgressConflict
+from sudoku_api.progress_buffer import ProgressBuffer
+
+
+class FakeDB:
+    """game_progress en memoria con las versiones de PuzzleDB"""
+
+    def __init__(self):
+        self.rows = {}
+        self.batches = []
+        self.saved = []
+        self.fail = False
+        # Si se define, los lotes esperan este Event (escritura lenta)
+        self.gate = None
+        self.batch_started = threading.Event()
+
+    def _write(self, progress, **changes):
+        key = (progress["user_id"], progress["puzzle_id"])
+        row = self.rows.get(key, {"version": 0, "completed_at": None})
+        row = {**row, **progress, **changes, "version": row["version"] + 1}
+        if row["completed"]:
+            row["completed_at"] = "now"
+        self.rows[key] = row
+        return dict(row)
+
+    def save_progress_batch(self, entries):
+        self.batch_started.set()
+        if self.gate is not None:
+            self.gate.wait()
+        if self.fail:
+            raise ConnectionError("db down")
+        self.batches.append(entries)
+        written = {}
+        for progress in entries:
+            key = (progress["user_id"], progress["puzzle_id"])
+            if not self.rows.get(key, {}).get("completed"):
+                written[key] = self._write(progress)["version"]
+        return written
+
+    def save_progress(self, **progress):
+        self.saved.append(progress)
+        return self._write(progress)
+
+    def apply_progress_moves(self, moves, base_version, **progress):
+        if self.gate is not None:
+            self.gate.wait()
+        key = (progress["user_id"], progress["puzzle_id"])
+        row = self.rows.get(key)
+        if row is None or row["version"] != base_version:
+            raise ProgressConflict(row and row["version"])
+        state = [list(r) for r in row["current_state"]]
+        for r, c, value in moves:
+            state[r][c] = value
+        self.saved.append({**progress, "moves": moves})
+        return self._write(progress, current_state=state)
+
+
+def progress(puzzle_id, time_elapsed, completed=False, user_id="u1"):
+    return {
+        "user_id": user_id,
+        "puzzle_id": puzzle_id,
+        "current_state": [[0] * 9 for _ in range(9)],
+        "time_elapsed": time_elapsed,
+        "hints_used": 0,
+        "completed": completed,
+        "variant_seed": 0,
+    }
+
+
+class TestProgressBuffer(TestCase):
+    def setUp(self):
+        self.db = FakeDB()
+        # Intervalo largo: los flushes de los tests son explícitos
+        self.buffer = ProgressBuffer(lambda: self.db, flush_interval=3600, max_pending=100)
+
+    def test_coalesces_latest_state_per_game(self):
+        # La primera escritura de cada partida va directo para conocer su versión
+        for game in (progress(1, 1), progress(2, 1), progress(1, 1, user_id="u2")):
+            self.assertEqual(self.buffer.save(**game)["version"], 1)
+        self.assertEqual(len(self.db.saved), 3)
+
+        for seconds in (10, 20, 30):
+            row = self.buffer.save(**progress(1, seconds))
+            self.assertEqual(row["version"], 2)
+        self.buffer.save(**progress(2, 5))
+        self.buffer.save(**progress(1, 5, user_id="u2"))
+
+        self.assertEqual(self.buffer.flush(), 3)
+        times = {(e["user_id"], e["puzzle_id"]): e["time_elapsed"] for e in self.db.batches[0]}
+        self.assertEqual(times, {("u1", 1): 30, ("u1", 2): 5, ("u2", 1): 5})
+        self.assertEqual(self.db.rows[("u1", 1)]["version"], 2)
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.buffer.stats()["coalesce_ratio"], 1.3)
+
+    def test_completed_writes_through_and_drops_pending(self):
+        self.buffer.save(**progress(1, 5))
+        self.buffer.save(**progress(1, 10))
+        row = self.buffer.save(**progress(1, 40, completed=True))
+
+        self.assertEqual(row["completed_at"], "now")
+        self.assertEqual(len(self.db.saved), 2)
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_moves_write_pending_state_first(self):
+        self.buffer.save(**progress(1, 5))
+        announced = self.buffer.save(**progress(1, 10))["version"]
+        row = self.buffer.apply_moves(
+            **progress(1, 12), base_version=announced, moves=[[0, 0, 5]]
+        )
+
+        self.assertEqual(self.db.batches[0][0]["time_elapsed"], 10)
+        self.assertEqual(row["current_state"][0][0], 5)
+        self.assertEqual(row["version"], announced + 1)
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_slow_flush_only_blocks_its_games(self):
+        self.buffer.save(**progress(1, 1))
+        self.buffer.save(**progress(2, 1))
+        self.buffer.save(**progress(1, 10))
+
+        self.db.gate = threading.Event()
+        flushing = threading.Thread(target=self.buffer.flush)
+        flushing.start()
+        self.db.batch_started.wait(1)
+
+        # Otra partida no espera al lote
+        self.assertTrue(self.buffer.save(**progress(2, 40, completed=True))["completed"])
+
+        # La partida del lote espera a que termine antes de escribir
+        finishing = threading.Thread(
+            target=self.buffer.save, kwargs=progress(1, 50, completed=True)
+        )
+        finishing.start()
+        finishing.join(0.2)
+        self.assertTrue(finishing.is_alive())
+
+        self.db.gate.set()
+        flushing.join(1)
+        finishing.join(1)
+        row = self.db.rows[("u1", 1)]
+        self.assertEqual((row["completed"], row["time_elapsed"]), (True, 50))
+
+    def test_moves_only_block_their_game(self):
+        versions = {game: self.buffer.save(**progress(game, 1))["version"] for game in (1, 2)}
+        self.db.gate = threading.Event()
+
+        slow = threading.Thread(
+            target=self.buffer.apply_moves,
+            kwargs={**progress(1, 5), "base_version": versions[1], "moves": [[0, 0, 1]]},
+        )
+        slow.start()
+        slow.join(0.1)
+        self.assertTrue(slow.is_alive())
+
+        # La partida 2 no queda detrás de la 1
+        other = threading.Thread(
+            target=self.buffer.save, kwargs=progress(2, 9, completed=True)
+        )
+        other.start()
+        other.join(1)
+        self.assertFalse(other.is_alive())
+
+        self.db.gate.set()
+        slow.join(1)
+        self.assertEqual(self.db.rows[("u1", 1)]["current_state"][0][0], 1)
+
+    def test_failed_flush_keeps_newer_entries(self):
+        self.buffer.save(**progress(1, 1))
+        self.buffer.save(**progress(2, 1))
+        self.buffer.save(**progress(1, 10))
+        self.buffer.save(**progress(2, 10))
+        self.db.fail = True
+        self.assertRaises(ConnectionError, self.buffer.flush)
+
+        # Versión desconocida tras el fallo: el siguiente guardado va directo
+        self.db.fail = False
+        row = self.buffer.save(**progress(1, 20))
+        self.assertEqual((row["time_elapsed"], row["version"]), (20, 2))
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self.db.batches[-1][0]["time_elapsed"], 10)
+        self.assertEqual(self.buffer.stats()["flush_errors"], 1)
+
+
+class TestProgressSaveWithBuffer(TestCase):
+    """Secuencia completa de /progress/save con el buffer activo"""
+
+    def setUp(self):
+        from app import app
+
+        self.db = FakeDB()
+        self.buffer = ProgressBuffer(lambda: self.db, flush_interval=3600)
+        self.client = app.test_client()
+        patches = [
+            patch("sudoku_api.auth.verify_firebase_token", return_value={"uid": "u1"}),
+            patch(
+                "sudoku_api.resources.user.get_progress_buffer", return_value=self.buffer
+            ),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def post(self, body):
+        response = self.client.post(
+            "/api/progress/save", json=body, headers={"Authorization": "Bearer token"}
+        )
+        return response.status_code, response.get_json()
+
+    def full_save(self, time_elapsed):
+        body = progress(7, time_elapsed)
+        del body["user_id"]
+        status, data = self.post(body)
+        self.assertEqual(status, 200)
+        return data["data"]["progress"]["version"]
+
+    def move(self, base_version, cell_value):
+        return self.post(
+            {
+                "puzzle_id": 7,
+                "base_version": base_version,
+                "moves": [[0, 0, cell_value]],
+                "time_elapsed": 50,
+            }
+        )
+
+    def test_moves_after_full_saves(self):
+        version = self.full_save(10)
+        status, data = self.move(version, 3)
+        self.assertEqual(status, 200)
+
+        # Guardado completo en buffer y movimientos sobre la versión anunciada
+        version = self.full_save(20)
+        self.assertIsNotNone(version)
+        status, data = self.move(version, 4)
+        self.assertEqual(status, 200)
+        self.assertEqual(data["data"]["progress"]["version"], self.db.rows[("u1", 7)]["version"])
+        self.assertEqual(self.db.rows[("u1", 7)]["current_state"][0][0], 4)
+
+    def test_conflict_then_full_save_recovers(self):
+        version = self.full_save(10)
+        # Otro dispositivo (u otro worker) escribe antes
+        self.db.save_progress(**progress(7, 15))
+
+        status, data = self.move(version, 3)
+        self.assertEqual(status, 409)
+        self.assertEqual(data["current_version"], version + 1)
+
+        version = self.full_save(20)
+        self.assertEqual(version, self.db.rows[("u1", 7)]["version"])
+        status, _ = self.move(version, 3)
+        self.assertEqual(status, 200)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import os
+import sys
+import threading
+import time
+from unittest import TestCase, main
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sudoku_api.puzzle_pool import PuzzlePool
+
+
+class FakeDB:
+    """Puzzles numerados en orden; registra cada query"""
+
+    def __init__(self):
+        self.next_id = 0
+        self.direct = []
+        self.refills = []
+        self.refilled = []
+        self.fail = False
+        # Si se define, los rellenos esperan este Event (query lento)
+        self.gate = None
+
+    def _puzzle(self, difficulty):
+        self.next_id += 1
+        return {"id": self.next_id, "difficulty": difficulty}
+
+    def find_puzzle(self, difficulty):
+        self.direct.append(difficulty)
+        return self._puzzle(difficulty)
+
+    def find_random_puzzles(self, difficulty, count):
+        if self.gate is not None:
+            self.gate.wait()
+        self.refills.append((difficulty, count))
+        if self.fail:
+            raise ConnectionError("db down")
+        puzzles = [self._puzzle(difficulty) for _ in range(count)]
+        self.refilled.extend(puzzles)
+        return puzzles
+
+
+class TestPuzzlePool(TestCase):
+    def setUp(self):
+        self.db = FakeDB()
+        self.pool = PuzzlePool(lambda: self.db, low_watermark=2, high_watermark=4)
+
+    def wait_refills(self, count):
+        """Espera a que terminen `count` rellenos (correctos o fallidos)"""
+        deadline = time.monotonic() + 1
+        while time.monotonic() < deadline:
+            stats = self.pool.stats()
+            if stats["refills"] + stats["refill_errors"] >= count:
+                return stats
+            time.sleep(0.005)
+        self.fail(f"no terminaron {count} rellenos")
+
+    def test_cold_pool_falls_back_and_refills(self):
+        puzzle = self.pool.get("EASY")
+
+        self.assertEqual(puzzle["difficulty"], "EASY")
+        self.assertEqual(self.db.direct, ["EASY"])
+        stats = self.wait_refills(1)
+        self.assertEqual(self.db.refills, [("EASY", 4)])
+        self.assertEqual((stats["hits"], stats["misses"]), (0, 1))
+        self.assertEqual(stats["sizes"], {"EASY": 4})
+
+    def test_serves_from_reservoir(self):
+        self.pool.get("EASY")
+        self.wait_refills(1)
+
+        # Sale en el orden del relleno, sin ir a la BD
+        self.assertIs(self.pool.get("EASY"), self.db.refilled[0])
+        self.assertIs(self.pool.get("EASY"), self.db.refilled[1])
+        self.assertEqual(self.db.direct, ["EASY"])
+        stats = self.pool.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertEqual(stats["hit_rate"], 0.667)
+        self.assertEqual(stats["sizes"], {"EASY": 2})
+        self.assertEqual(len(self.db.refills), 1)
+
+    def test_refills_below_low_watermark(self):
+        self.pool.get("EASY")
+        self.wait_refills(1)
+        self.pool.get("EASY")
+        self.pool.get("EASY")
+
+        # 1 < low_watermark: se completa hasta high_watermark
+        self.pool.get("EASY")
+        stats = self.wait_refills(2)
+        self.assertEqual(self.db.refills, [("EASY", 4), ("EASY", 3)])
+        self.assertEqual(stats["sizes"], {"EASY": 4})
+
+    def test_one_refill_per_difficulty(self):
+        self.db.gate = threading.Event()
+        for _ in range(3):
+            self.pool.get("EASY")
+        self.pool.get("HARD")
+
+        self.db.gate.set()
+        stats = self.wait_refills(2)
+        self.assertEqual(sorted(self.db.refills), [("EASY", 4), ("HARD", 4)])
+        self.assertEqual(stats["misses"], 4)
+        self.assertEqual(len(self.db.direct), 4)
+
+    def test_failed_refill_keeps_serving(self):
+        self.db.fail = True
+        self.assertEqual(self.pool.get("EASY")["difficulty"], "EASY")
+        stats = self.wait_refills(1)
+        self.assertEqual((stats["refills"], stats["refill_errors"]), (0, 1))
+
+        # El siguiente pedido vuelve a intentar el relleno
+        self.db.fail = False
+        self.pool.get("EASY")
+        self.assertEqual(self.wait_refills(2)["sizes"], {"EASY": 4})
+
+    def test_zero_high_watermark_disables_pool(self):
+        pool = PuzzlePool(lambda: self.db, low_watermark=0, high_watermark=0)
+        pool.get("EASY")
+        pool.get("EASY")
+
+        self.assertEqual(self.db.direct, ["EASY", "EASY"])
+        self.assertEqual(self.db.refills, [])
+        stats = pool.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["sizes"]), (0, 0, {}))
+
+
+if __name__ == "__main__":
+    main()
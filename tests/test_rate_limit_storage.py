@@ -0,0 +1,58 @@
+from unittest import TestCase, main
+from flask import Flask
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from limits.storage import storage_from_string
+from sudoku_api.rate_limit_storage import LocallyCheckedStorage
+
+
+class CountingStorage:
+    """Cuenta los accesos al storage compartido"""
+
+    def __init__(self, shared):
+        self.shared = shared
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attribute = getattr(self.shared, name)
+        if callable(attribute):
+            self.calls += 1
+        return attribute
+
+
+class TestLocallyCheckedStorage(TestCase):
+    def test_rejects_locally_once_shared_window_is_full(self):
+        storage = storage_from_string("local+memory://")
+        self.assertIsInstance(storage, LocallyCheckedStorage)
+        storage.shared = CountingStorage(storage.shared)
+
+        results = [storage.acquire_entry("k", 3, 60) for _ in range(10)]
+        self.assertEqual(results, [True] * 3 + [False] * 7)
+        # 3 aceptados + el rechazo que consulta la ventana; el resto es local
+        self.assertEqual(storage.shared.calls, 5)
+        self.assertEqual(storage.local_rejections, 6)
+        self.assertEqual(storage.get_moving_window("k", 3, 60)[1], 3)
+
+        storage.clear("k")
+        self.assertTrue(storage.acquire_entry("k", 3, 60))
+
+    def test_flask_limiter_with_moving_window(self):
+        app = Flask(__name__)
+        app.config.update(
+            RATELIMIT_STORAGE_URI="local+memory://", RATELIMIT_STRATEGY="moving-window"
+        )
+        limiter = Limiter(key_func=get_remote_address, app=app)
+
+        @app.route("/")
+        @limiter.limit("2/minute")
+        def index():
+            return "ok"
+
+        client = app.test_client()
+        statuses = [client.get("/").status_code for _ in range(4)]
+        self.assertEqual(statuses, [200, 200, 429, 429])
+        self.assertIsInstance(limiter.storage, LocallyCheckedStorage)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import json
+from unittest import TestCase, main
+from sudoku_api.serialization import cached_puzzle_body, encode_puzzle
+from sudoku_api.transforms import SEED_GRID
+
+SOLUTION = [list(row) for row in SEED_GRID]
+PLAYABLE = [row[:] for row in SOLUTION]
+PLAYABLE[0][0] = PLAYABLE[4][7] = 0
+PUZZLE = {
+    "id": 7,
+    "difficulty": "EASY",
+    "coefficient": 3.14159,
+    "playable_grid": PLAYABLE,
+    "solution_grid": SOLUTION,
+}
+
+
+class TestPuzzleSerialization(TestCase):
+    def test_game_payload(self):
+        data = json.loads(encode_puzzle(PUZZLE))["data"]
+        self.assertEqual(data["playable"]["grid"], PLAYABLE)
+        self.assertEqual(data["difficulty"], {"level": "EASY", "coefficient": 3.14})
+        self.assertEqual(data["metadata"]["empty_cells"], 2)
+        self.assertEqual(data["metadata"]["hints_coordinates"], [[0, 0], [4, 7]])
+        self.assertNotIn("is_daily", data["metadata"])
+
+    def test_cached_body_is_reused(self):
+        body = cached_puzzle_body(PUZZLE, 99, day="2026-01-01")
+        self.assertIs(cached_puzzle_body(PUZZLE, 99, day="2026-01-01"), body)
+        metadata = json.loads(body)["data"]["metadata"]
+        self.assertEqual(metadata["variant_seed"], 99)
+        self.assertTrue(metadata["is_daily"])
+        self.assertEqual(metadata["empty_cells"], 2)
+
+
+if __name__ == "__main__":
+    main()
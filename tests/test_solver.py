@@ -0,0 +1,72 @@
+from unittest import TestCase, main
+from sudoku_api.enums import SolverBackend
+from sudoku_api.sudoku_board import SudokuBoard
+from sudoku_api.sudoku_solver import OptimizedSudokuSolver
+
+
+def _board(puzzle):
+    return SudokuBoard([[int(puzzle[r * 9 + c]) for c in range(9)] for r in range(9)])
+
+
+class TestSolverBackends(TestCase):
+    SOLVED = (
+        "624539187519728634837614295143865729958247361762391458"
+        "371956842496182573285473916"
+    )
+
+    # Corpus compartido: (puzzle, número de soluciones esperado, máximo 2)
+    CORPUS = [
+        (SOLVED, 1),
+        (SOLVED[:80] + "0", 1),
+        (
+            "800000000003600000070090200050007000000045700000100030001000068008500010"
+            "090000400",
+            1,
+        ),
+        (
+            "000000010400000000020000000000050407008000300001090000300400200050100000"
+            "000806000",
+            1,
+        ),
+        (
+            "100007090030020008009600500005300900010080002600004000300000010040000007"
+            "007000300",
+            1,
+        ),
+        ("0" * 81, 2),
+        ("0" * 18 + SOLVED[18:], 2),
+        ("66" + "0" * 79, 0),
+        ("123456780000000009" + "0" * 63, 0),
+    ]
+
+    def _solutions(self, puzzle, backend):
+        solver = OptimizedSudokuSolver(_board(puzzle))
+        return solver._find_solutions(backend)
+
+    def test_backends_agree_on_corpus(self):
+        for puzzle, expected in self.CORPUS:
+            mrv = self._solutions(puzzle, SolverBackend.MRV)
+            dlx = self._solutions(puzzle, SolverBackend.DLX)
+            self.assertEqual(len(mrv), expected, puzzle)
+            self.assertEqual(len(dlx), expected, puzzle)
+            if expected == 1:
+                self.assertEqual(mrv[0], dlx[0])
+                self.assertTrue(dlx[0].is_valid)
+
+    def test_solve_selects_backend(self):
+        for backend in SolverBackend:
+            board = _board(self.CORPUS[2][0])
+            solution = OptimizedSudokuSolver(board).solve(backend=backend)
+            self.assertTrue(solution.is_valid)
+            self.assertEqual(board, _board(self.CORPUS[2][0]))
+
+    def test_has_unique_solution(self):
+        for backend in SolverBackend:
+            self.assertTrue(
+                OptimizedSudokuSolver(_board(self.CORPUS[3][0])).has_unique_solution(backend)
+            )
+            self.assertFalse(OptimizedSudokuSolver(_board("0" * 81)).has_unique_solution(backend))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from unittest import TestCase, main
-from sudoku_api.validator import Validator
+from sudoku_api.validator import Validator, validate_batch
 
 
 class TestValidator(TestCase):
@@ -33,6 +33,19 @@ class TestValidator(TestCase):
     def test_invalid_board(self):
         self.assertFalse(Validator(self.INVALID_BOARD).is_valid)
 
+    def test_validate_batch(self):
+        incomplete = [row[:] for row in self.VALID_BOARD]
+        incomplete[8][8] = 0
+        grids = [self.VALID_BOARD, self.INVALID_BOARD, incomplete]
+
+        valid, masks = validate_batch(grids, return_masks=True)
+
+        self.assertEqual(valid.tolist(), [True, False, False])
+        self.assertEqual(masks["rows"][1].nonzero()[0].tolist(), [0, 4, 7])
+        self.assertEqual(masks["columns"][1].nonzero()[0].tolist(), [4])
+        self.assertEqual(masks["boxes"][2].nonzero()[0].tolist(), [8])
+        self.assertEqual(validate_batch(grids[:1]).tolist(), [True])
+
 
 if __name__ == "__main__":
     main()